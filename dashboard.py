@@ -75,10 +75,9 @@ def main(config_path):
         if authentification_enabled:
             if "authenticator" not in st.session_state:
                 try:
-                    with open(
-                        st.session_state["config"].get("dash_auth_file", None), "r"
-                    ) as file:
-                        auth_config = yaml.safe_load(file)
+                    auth_config = bagman_utils.read_yaml(
+                        st.session_state["config"].get("dash_auth_file", None)
+                    )
                 except FileNotFoundError:
                     st.error("Authentication file not found.")
                     st.stop()
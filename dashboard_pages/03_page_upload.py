@@ -1,7 +1,6 @@
 import os
 
 import streamlit as st
-import yaml
 
 from bagman.utils import bagman_utils
 from bagman.utils.db import BagmanDB
@@ -47,7 +46,7 @@ def main():
 
     metadata = {key: "" for key in st.session_state["config"]["metadata_recorder"]}
     if metadata_file:
-        metadata_file = yaml.safe_load(metadata_file.getvalue())
+        metadata_file = bagman_utils.parse_yaml(metadata_file.getvalue())
         metadata.update(metadata_file)
     metadata["name"] = recording_name
 
@@ -100,13 +99,12 @@ def main():
                 progress_bar.progress((i + 1) / total_files)
 
             # write updated metadata file (bagman_utils.add_recording will add/update rec info)
-            with open(
+            bagman_utils.save_yaml_file(
+                st.session_state.metadata,
                 os.path.join(
                     recording_path, st.session_state["config"]["metadata_file"]
                 ),
-                "w",
-            ) as f:
-                yaml.dump(st.session_state.metadata, f)
+            )
 
             # check if all files were uploaded correctly (TODO use checksum instead of file size)
             for file in mcap_files + other_files:
@@ -130,7 +128,9 @@ def main():
             db,
             recording_path,
             metadata_file_name=st.session_state["config"]["metadata_file"],
-            sort_by=st.session_state["config"].get("database_sort_by", "start_time"),
+            checksum_algorithm=st.session_state["config"].get(
+                "checksum_algorithm", "sha256"
+            ),
         )
         del db
 
@@ -1,4 +1,3 @@
-import glob
 import io
 import os
 import zipfile
@@ -11,9 +10,34 @@ import streamlit as st
 import streamlit.components.v1 as components
 
 
+def _list_files(directory, recursive=False):
+    # sizes of the files by path, hidden files are skipped like glob does
+    files = {}
+    directories = [directory]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        if recursive:
+                            directories.append(entry.path)
+                    else:
+                        files[entry.path] = entry.stat().st_size
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return dict(sorted(files.items()))
+
+
 @st.cache_data
 def load_recordings(_database, config, check_integrity=True):
-    data = _database.get_all_records()
+    # newest recordings on top
+    sort_by = config.get("database_sort_by", "start_time")
+    if sort_by:
+        data = _database.get_all_records_sorted(sort_by, reverse=True)
+    else:
+        data = _database.get_all_records()
     df = pd.DataFrame(data, index=None)
     columns = df.columns.tolist()
 
@@ -28,8 +52,6 @@ def load_recordings(_database, config, check_integrity=True):
                 )
 
     df = df.drop(columns=config["dash_cols_ignore"], errors="ignore")
-    # df = df.iloc[::-1] # data is already sorted, oldest on top
-    df = df.sort_values(by="start_time", ascending=False)
 
     # convert datetime and datetime columns
     timezone = datetime.now().astimezone().tzinfo
@@ -84,10 +106,11 @@ def select_recording(selected_recording, database, config):
             st.info("map not available")
 
     with tab_video:
-        video_files = glob.glob(
-            os.path.join(recording_data["path"], config["resources_folder"], "*.mp4"),
+        video_files = _list_files(
+            os.path.join(recording_data["path"], config["resources_folder"]),
             recursive=False,
         )
+        video_files = [file for file in video_files if file.endswith(".mp4")]
         if video_files:
             for video_file in video_files:
                 st.text(os.path.basename(video_file))
@@ -116,15 +139,11 @@ def select_recording(selected_recording, database, config):
 
         # TODO add option to select by topic/message -> filter and create new .mcap
 
-        files = glob.glob(
-            os.path.join(recording_data["path"], "**", "*"), recursive=True
-        )
+        files = _list_files(recording_data["path"], recursive=True)
         selected_files = []
-        for file in files:
-            if os.path.isdir(file):
-                continue
+        for file, file_size in files.items():
             file_path = os.path.relpath(file, recording_data["path"])
-            file_size = os.path.getsize(file) / (1024 * 1024)  # convert to MB
+            file_size = file_size / (1024 * 1024)  # convert to MB
             if st.checkbox(f"{file_path} ({file_size:.2f} MB)", key=file, value=False):
                 selected_files.append(file)
 
@@ -43,8 +43,8 @@ def add_recording(recording_name, config):
             metadata_file_name=config["metadata_file"],
             use_existing_metadata=False,
             override_db=True,
-            sort_by=config["database_sort_by"],
             store_metadata_file=True,
+            checksum_algorithm=config.get("checksum_algorithm", "sha256"),
         )
     except Exception as e:
         logger.error(f"Failed to add recording: {e}")
@@ -54,10 +54,9 @@ def add_recording(recording_name, config):
 
 
 @task
-def generate_map_plot(recording_name, config_file):
+def generate_map_plot(recording_name, config):
     logger = get_run_logger()
     logger.info(f"Generating map for {recording_name}...")
-    config = bagman_utils.load_config(config_file)
     bagman_utils.generate_map(
         os.path.join(config["recordings_storage"], recording_name), config
     )
@@ -65,10 +64,9 @@ def generate_map_plot(recording_name, config_file):
 
 
 @task
-def generate_video_files(recording_name, config_file):
+def generate_video_files(recording_name, config):
     logger = get_run_logger()
     logger.info(f"Generating video for {recording_name}...")
-    config = bagman_utils.load_config(config_file)
     bagman_utils.generate_video(
         os.path.join(config["recordings_storage"], recording_name), config
     )
@@ -76,10 +74,9 @@ def generate_video_files(recording_name, config_file):
 
 
 @task
-def compress_video(recording_name, config_file):
+def compress_video(recording_name, config):
     logger = get_run_logger()
     logger.info(f"Compressing video for {recording_name}...")
-    config = bagman_utils.load_config(config_file)
 
     try:
         bagman_utils.compress_recording_image(
@@ -103,9 +100,10 @@ def flow_default(recording_name: str, config_file: str):
 
     logger.info("Starting flow tasks...")
     result_add_recording = add_recording(recording_name, config)
-    generate_map_plot(recording_name, config_file, wait_for=[result_add_recording])
-    generate_video_files(recording_name, config_file, wait_for=[result_add_recording])
-    compress_video(recording_name, config_file, wait_for=[result_add_recording])
+    # the config is loaded once and passed to all tasks
+    generate_map_plot(recording_name, config, wait_for=[result_add_recording])
+    generate_video_files(recording_name, config, wait_for=[result_add_recording])
+    compress_video(recording_name, config, wait_for=[result_add_recording])
     logger.info("Flow completed.")
 
 
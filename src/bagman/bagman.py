@@ -137,7 +137,9 @@ def arg_parser():
     return parser
 
 
-def add_or_update_recording(db, recording_path, metadata_file_name, sort_by, add=True):
+def add_or_update_recording(
+    db, recording_path, metadata_file_name, add=True, checksum_algorithm="sha256"
+):
     exists_recording = db.contains_record("name", os.path.basename(recording_path))
 
     if add:
@@ -177,8 +179,8 @@ def add_or_update_recording(db, recording_path, metadata_file_name, sort_by, add
             metadata_file_name=metadata_file_name,
             use_existing_metadata=use_existing_metadata,
             override_db=True,
-            sort_by=sort_by,
             store_metadata_file=True,
+            checksum_algorithm=checksum_algorithm,
         )
     except Exception as e:
         logging.error(f"Failed to add/update recording: {str(e)}")
@@ -273,8 +275,8 @@ def main():
                 db,
                 recording_path,
                 config["metadata_file"],
-                config.get("database_sort_by", "start_time"),
                 True,
+                config.get("checksum_algorithm", "sha256"),
             )
 
     elif args.command == "add":
@@ -284,8 +286,8 @@ def main():
                 db,
                 recording_path,
                 config["metadata_file"],
-                config.get("database_sort_by", "start_time"),
                 True,
+                config.get("checksum_algorithm", "sha256"),
             )
         except Exception as e:
             logging.error(f"Failed to add recording: {str(e)}")
@@ -298,8 +300,8 @@ def main():
                 db,
                 recording_path,
                 config["metadata_file"],
-                config.get("database_sort_by", "start_time"),
                 False,
+                config.get("checksum_algorithm", "sha256"),
             )
         except Exception as e:
             logging.error(f"Failed to update recording: {str(e)}")
@@ -380,6 +382,7 @@ def main():
                 metadata_file_name=config["metadata_file"],
                 merge_existing=True,
                 store_file=True,
+                checksum_algorithm=config.get("checksum_algorithm", "sha256"),
             )
         except Exception as e:
             logging.error(f"Metadata generation failed: {str(e)}")
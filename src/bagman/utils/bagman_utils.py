@@ -1,17 +1,40 @@
-import hashlib
+import copy
+import json
 import logging
+import mmap
 import os
 import re
 import shutil
+import stat
 import time
-from math import atan2, cos, radians, sin, sqrt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 
+import numpy as np
 import yaml
 from dotenv import load_dotenv
-from scipy.signal import medfilt
+from scipy.ndimage import median_filter
 
 from bagman.utils import mcap_utils, plot_utils
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# use libyaml's C implementation if available
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# files below this size are read with plain I/O where mmap setup cost dominates
+MMAP_MIN_FILE_SIZE = 4096
+
+# number of parsed YAML files kept in memory by read_yaml
+YAML_CACHE_SIZE = 256
+
+# kernel size of the median filter applied to the velocities in generate_map
+VELOCITY_FILTER_SIZE = 9
+
 
 def replace_env_vars(value):
     """
@@ -47,8 +70,7 @@ def load_config(file_path="config.yaml"):
     # load environment variables from .env file if it exists
     load_dotenv()
 
-    with open(file_path, "r") as file:
-        raw_config = yaml.safe_load(file)
+    raw_config = read_yaml(file_path)
 
     return replace_env_vars(raw_config)
 
@@ -58,7 +80,7 @@ def upload_recording(local_path, storage_path, move=False):
     Upload a recording to the specified recordings directory.
 
     Args:
-        local_path (str): The path to the recording file to be uploaded.
+        local_path (str): The path to the recording file or directory to be uploaded.
         storage_path (str): The path to the recordings directory where the file will be uploaded.
         move (bool, optional): If True, the recording file will be moved to the recordings directory.
                                If False, the recording file will be copied. Default is False.
@@ -66,19 +88,204 @@ def upload_recording(local_path, storage_path, move=False):
     Raises:
         FileNotFoundError: If the recordings directory does not exist.
         FileNotFoundError: If the recording file does not exist.
+        NotADirectoryError: If the recordings path is not a directory.
     """
 
-    if not os.path.exists(storage_path):
+    try:
+        storage_stat = os.stat(storage_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"The directory {storage_path} does not exist.")
-    if not os.path.exists(local_path):
+    if not stat.S_ISDIR(storage_stat.st_mode):
+        raise NotADirectoryError(f"{storage_path} is not a directory.")
+    try:
+        local_stat = os.stat(local_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"The file {local_path} does not exist.")
 
+    is_dir = stat.S_ISDIR(local_stat.st_mode)
+    destination = os.path.join(
+        storage_path, os.path.basename(os.path.normpath(local_path))
+    )
+
     logging.info(f"Uploading {local_path} to {storage_path}...")
+    if move:
+        try:
+            # renaming is atomic and does not copy any data on the same file system
+            os.replace(local_path, destination)
+            return
+        except OSError:
+            # different file system or existing recording directory, copy instead
+            pass
+
     # TODO add progress bar
-    shutil.copy(local_path, storage_path)
+    # copyfile skips the permission bits and uses sendfile on Linux
+    if is_dir:
+        shutil.copytree(
+            local_path, destination, copy_function=shutil.copyfile, dirs_exist_ok=True
+        )
+    else:
+        shutil.copyfile(local_path, destination)
+
     if move:
         # TODO check if upload was successful
-        os.remove(local_path)
+        if is_dir:
+            shutil.rmtree(local_path)
+        else:
+            os.remove(local_path)
+
+
+def parse_yaml(stream):
+    """
+    Parse YAML content with the safe loader, using libyaml if available.
+    Args:
+        stream: The YAML content as a string, bytes or file-like object.
+    Returns:
+        The parsed YAML content.
+    Raises:
+        yaml.YAMLError: If there is an error parsing the YAML content.
+    """
+
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
+def read_yaml(file_path):
+    """
+    Parse a YAML file, reusing the previous result if the file did not change.
+    Args:
+        file_path (str): The path to the YAML file.
+    Returns:
+        The parsed YAML content.
+    Raises:
+        FileNotFoundError: If the specified file is not found.
+        yaml.YAMLError: If there is an error parsing the YAML file.
+    """
+
+    st = os.stat(file_path)
+    content = _read_yaml_cached(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    # callers update the returned data, keep the cached copy untouched
+    return copy.deepcopy(content)
+
+
+@lru_cache(maxsize=YAML_CACHE_SIZE)
+def _read_yaml_cached(file_path, mtime_ns, size):
+    # modification time and size are part of the cache key, changed files are parsed again
+    if file_path.endswith(".json"):
+        # metadata can also be stored as JSON, which is parsed much faster than YAML
+        with open(file_path, "rb") as file:
+            data = file.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+    # O_BINARY keeps Windows from translating line endings
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if os.fstat(fd).st_size < MMAP_MIN_FILE_SIZE:
+            with os.fdopen(fd, "rb", closefd=False) as file:
+                return parse_yaml(file)
+
+        if hasattr(mmap, "MAP_PRIVATE"):
+            mm = mmap.mmap(
+                fd,
+                0,
+                flags=mmap.MAP_PRIVATE | getattr(mmap, "MAP_POPULATE", 0),
+                prot=mmap.PROT_READ,
+            )
+        else:  # flags and prot are not available on Windows
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            return parse_yaml(mm)
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+
+
+def _compose_yaml_node(loader):
+    # build the node of the next value from the event stream
+    event = loader.get_event()
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        return yaml.ScalarNode(tag, event.value, style=event.style)
+
+    if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+        is_sequence = isinstance(event, yaml.SequenceStartEvent)
+        node_class = yaml.SequenceNode if is_sequence else yaml.MappingNode
+        end_event = yaml.SequenceEndEvent if is_sequence else yaml.MappingEndEvent
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(node_class, None, event.implicit)
+        value = []
+        while not loader.check_event(end_event):
+            if is_sequence:
+                value.append(_compose_yaml_node(loader))
+            else:
+                value.append((_compose_yaml_node(loader), _compose_yaml_node(loader)))
+        loader.get_event()
+        return node_class(tag, value, flow_style=event.flow_style)
+
+    # aliases would require the anchored nodes which may have been skipped
+    raise yaml.YAMLError(f"Unsupported event for partial loading: {event}")
+
+
+def _skip_yaml_node(loader):
+    # consume the events of the next value without building it
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def load_metadata_header(file, keys):
+    """
+    Load only some top-level keys from a metadata file.
+    The file is parsed until all keys have been found, values of other keys are skipped
+    without constructing them.
+    Args:
+        file (str): The path where the metadata file is located.
+        keys (list): The top-level keys to load.
+    Returns:
+        dict: The found keys and their values.
+    Raises:
+        FileNotFoundError: If the specified file is not found.
+        yaml.YAMLError: If there is an error parsing the YAML file.
+    """
+
+    keys = set(keys)
+    if not file.endswith(".json"):
+        with open(file, "rb") as stream:
+            loader = _YamlLoader(stream)
+            try:
+                # stream start, document start and the top-level mapping
+                loader.get_event()
+                loader.get_event()
+                if isinstance(loader.get_event(), yaml.MappingStartEvent):
+                    result = {}
+                    while keys - result.keys() and not loader.check_event(
+                        yaml.MappingEndEvent
+                    ):
+                        key = loader.construct_document(_compose_yaml_node(loader))
+                        if key in keys:
+                            node = _compose_yaml_node(loader)
+                            result[key] = loader.construct_document(node)
+                        else:
+                            _skip_yaml_node(loader)
+                    return result
+            except yaml.YAMLError:
+                # e.g. aliases, parse the whole file instead
+                pass
+            finally:
+                loader.dispose()
+
+    data = read_yaml(file)
+    if not isinstance(data, dict):
+        return {}
+    return {key: value for key, value in data.items() if key in keys}
 
 
 def load_yaml_file(file):
@@ -95,8 +302,7 @@ def load_yaml_file(file):
     """
 
     try:
-        with open(file, "r") as file:
-            return yaml.safe_load(file)
+        return read_yaml(file)
     except FileNotFoundError:
         logging.error(f"YAML file {os.path.basename(file)} not found.")
         return None
@@ -110,7 +316,7 @@ def load_yaml_file(file):
 
 def save_yaml_file(data, file_path):
     """
-    Save data to a YAML file.
+    Save data to a YAML file, or to a JSON file if the file name ends with .json.
     Args:
         data (dict): The data to be saved in YAML format.
         file_path (str): The path to the file where the data should be saved.
@@ -119,8 +325,16 @@ def save_yaml_file(data, file_path):
     """
 
     try:
+        if file_path.endswith(".json"):
+            with open(file_path, "wb") as file:
+                if orjson is not None:
+                    file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    file.write(json.dumps(data, indent=2).encode())
+            return
+
         with open(file_path, "w") as file:
-            yaml.dump(data, file, sort_keys=False)
+            yaml.dump(data, file, Dumper=_YamlDumper, sort_keys=False)
     except Exception as e:
         raise Exception(f"An error occurred while saving the YAML file: {e}")
 
@@ -130,13 +344,64 @@ def check_db_integrity(database, columns):
     pass
 
 
+def normalize_metadata(rec_metadata, recording_path):
+    """
+    Ensure that name and path in the recording metadata match the recording directory.
+    Args:
+        rec_metadata (dict): The recording metadata, modified in place.
+        recording_path (str): The path to the recording directory.
+    Returns:
+        bool: True if the metadata has been modified, False otherwise.
+    """
+    is_metadata_modified = False
+
+    # check that recording name is existing in metadata (required as UID in database)
+    if (
+        "name" not in rec_metadata.keys()
+        or not rec_metadata["name"]
+        or rec_metadata["name"] == ""
+    ):
+        logging.warning(
+            "Recording name not found in metadata, setting it to folder name."
+        )
+        rec_metadata["name"] = os.path.basename(recording_path)
+        is_metadata_modified = True
+    elif rec_metadata["name"] != os.path.basename(recording_path):
+        logging.warning(
+            "Recording name in metadata does not match folder name, setting it to folder name."
+        )
+        rec_metadata["name"] = os.path.basename(recording_path)
+        is_metadata_modified = True
+
+    # ensure that recording path in metadata is storage path and not local path
+    if "path" in rec_metadata.keys():
+        if rec_metadata["path"] != recording_path:
+            logging.warning(
+                "Recording path in metadata does not match the provided path, updating it."
+            )
+            rec_metadata["path"] = recording_path
+            is_metadata_modified = True
+    else:
+        rec_metadata["path"] = recording_path
+        is_metadata_modified = True
+
+    return is_metadata_modified
+
+
 def generate_metadata(
-    recording_path, metadata_file_name, merge_existing=True, store_file=True
+    recording_path,
+    metadata_file_name,
+    merge_existing=True,
+    store_file=True,
+    checksum_algorithm="sha256",
+    executor=None,
 ):
     metadata_file = os.path.join(recording_path, metadata_file_name)
 
     # generate metadata
-    rec_metadata = mcap_utils.get_rec_info(recording_path)
+    rec_metadata = mcap_utils.get_rec_info(
+        recording_path, checksum_algorithm=checksum_algorithm, executor=executor
+    )
 
     # merge with existing file
     if merge_existing and os.path.exists(metadata_file):
@@ -148,6 +413,9 @@ def generate_metadata(
         rec_metadata_old.update(rec_metadata)
         rec_metadata = rec_metadata_old
 
+    # fix name and path before serializing so the file is only written once
+    normalize_metadata(rec_metadata, recording_path)
+
     if store_file:
         # TODO backup old file (add feature to save_yaml_file())
         try:
@@ -158,36 +426,34 @@ def generate_metadata(
     return rec_metadata
 
 
-def add_recording(
-    database,
+def load_recording_metadata(
     recording_path,
     metadata_file_name="rec_metadata.yaml",
     use_existing_metadata=False,
-    override_db=True,
-    sort_by="start_time",
     store_metadata_file=True,
+    checksum_algorithm="sha256",
+    executor=None,
 ):
     """
-    Adds a recording into the specified database and optionally stores the recording metadata file.
+    Loads or generates the metadata of a recording, with name and path matching the recording directory.
     Args:
-        recording_path (str): The path to the recording file.
-        database (BagmanDB): An instance of the BagmanDB class.
+        recording_path (str): The path to the recording directory.
         metadata_file_name (str, optional): The name of the metadata file. Defaults to "rec_metadata.yaml".
         use_existing_metadata (bool, optional): If True, the existing metadata will be used. Defaults to False.
-        override_db (bool, optional): If True, existing records in db with the same path will be updated. Defaults to True.
-        sort_by (str, optional): The field by which to sort the database records. Defaults to "start_time".
         store_metadata_file (bool, optional): If True, the recording metadata will be stored in a YAML file at the recording path. Defaults to True.
+        checksum_algorithm (str, optional): The algorithm used for the file checksums when generating metadata. Defaults to "sha256".
+        executor (Executor, optional): The process pool the recording files are scanned in. Defaults to a new pool.
     Raises:
+        FileNotFoundError: If the existing metadata file could not be loaded.
         Exception: If there is an error writing the metadata file.
     Returns:
-        None
+        dict: The recording metadata.
     """
     metadata_file_path = os.path.join(recording_path, metadata_file_name)
-    time_added = time.time()
-    is_metadata_modified = False
 
     # use existing metadata file
-    if use_existing_metadata and os.path.exists(metadata_file_path):
+    use_existing_metadata = use_existing_metadata and os.path.exists(metadata_file_path)
+    if use_existing_metadata:
         rec_metadata = load_yaml_file(metadata_file_path)
         if rec_metadata is None:
             raise FileNotFoundError("Metadata file could not be loaded.")
@@ -199,69 +465,183 @@ def add_recording(
             metadata_file_name,
             merge_existing=True,
             store_file=store_metadata_file,
+            checksum_algorithm=checksum_algorithm,
+            executor=executor,
         )
 
-    # check that recording name is existing in metadata (required as UID in database)
-    if (
-        "name" not in rec_metadata.keys()
-        or not rec_metadata["name"]
-        or rec_metadata["name"] == ""
-    ):
-        logging.warning(
-            "Recording name not found in metadata, setting it to folder name."
-        )
-        rec_metadata["name"] = os.path.basename(recording_path)
-        is_metadata_modified = True
-    elif rec_metadata["name"] != os.path.basename(recording_path):
-        logging.warning(
-            "Recording name in metadata does not match folder name, setting it to folder name."
-        )
-        rec_metadata["name"] = os.path.basename(recording_path)
-        is_metadata_modified = True
-
-    # ensure that recording path in metadata is storage path and not local path
-    if "path" in rec_metadata.keys():
-        if rec_metadata["path"] != recording_path:
-            logging.warning(
-                "Recording path in metadata does not match the provided path, updating it."
-            )
-            rec_metadata["path"] = recording_path
-            is_metadata_modified = True
-
-    if is_metadata_modified and store_metadata_file:
+    # generated metadata is already normalized, only an existing file needs to be rewritten
+    is_metadata_modified = normalize_metadata(rec_metadata, recording_path)
+    if is_metadata_modified and use_existing_metadata and store_metadata_file:
         try:
             save_yaml_file(rec_metadata, metadata_file_path)
         except Exception as e:
             raise Exception(f"Error writing metadata file: {e}")
 
+    return rec_metadata
+
+
+def _get_time_added(existing_record, rec_metadata, time_added):
+    # keep the time a recording was first added, the path must not change
+    if existing_record["path"] != rec_metadata["path"]:
+        raise Exception(
+            "Found existing recording with same name but different path in database. Please resolve manually."
+        )
+    return existing_record.get("time_added", time_added)
+
+
+def add_recording(
+    database,
+    recording_path,
+    metadata_file_name="rec_metadata.yaml",
+    use_existing_metadata=False,
+    override_db=True,
+    store_metadata_file=True,
+    checksum_algorithm="sha256",
+):
+    """
+    Adds a recording into the specified database and optionally stores the recording metadata file.
+    Args:
+        recording_path (str): The path to the recording file.
+        database (BagmanDB): An instance of the BagmanDB class.
+        metadata_file_name (str, optional): The name of the metadata file. Defaults to "rec_metadata.yaml".
+        use_existing_metadata (bool, optional): If True, the existing metadata will be used. Defaults to False.
+        override_db (bool, optional): If True, existing records in db with the same path will be updated. Defaults to True.
+        store_metadata_file (bool, optional): If True, the recording metadata will be stored in a YAML file at the recording path. Defaults to True.
+        checksum_algorithm (str, optional): The algorithm used for the file checksums when generating metadata. Defaults to "sha256".
+    Raises:
+        Exception: If there is an error writing the metadata file.
+    Returns:
+        None
+    """
+    time_added = time.time()
+
+    rec_metadata = load_recording_metadata(
+        recording_path,
+        metadata_file_name=metadata_file_name,
+        use_existing_metadata=use_existing_metadata,
+        store_metadata_file=store_metadata_file,
+        checksum_algorithm=checksum_algorithm,
+    )
+
     # override existing entry in db
     if database.contains_record("name", rec_metadata["name"]):
         if not override_db:
             return
 
         existing_record = database.get_record("name", rec_metadata["name"])
-
-        # check that path is the same
-        if existing_record["path"] != rec_metadata["path"]:
-            raise Exception(
-                "Found existing recording with same name but different path in database. Please resolve manually."
-            )
-
-        if "time_added" in existing_record.keys():
-            time_added = existing_record["time_added"]
+        time_added = _get_time_added(existing_record, rec_metadata, time_added)
 
     rec_metadata["time_added"] = time_added
     database.upsert_record(rec_metadata, "name", rec_metadata["name"])
+    database.refresh()
+
 
-    # sort the database (default sort by start_time, oldest on top)
-    # TODO insert at correct position instead of sorting the whole database
-    if sort_by and sort_by != "" and sort_by in rec_metadata.keys():
-        all_records = database.get_all_records()
-        sorted_records = sorted(
-            all_records, key=lambda x: x.get(sort_by, ""), reverse=False
+def add_recordings(
+    database,
+    recording_paths,
+    metadata_file_name="rec_metadata.yaml",
+    use_existing_metadata=False,
+    override_db=True,
+    store_metadata_file=True,
+    checksum_algorithm="sha256",
+    max_workers=None,
+):
+    """
+    Adds multiple recordings into the specified database, new recordings are inserted in a single batch.
+    Args:
+        database (BagmanDB): An instance of the BagmanDB class.
+        recording_paths (List[str]): The paths to the recording directories.
+        metadata_file_name (str, optional): The name of the metadata file. Defaults to "rec_metadata.yaml".
+        use_existing_metadata (bool, optional): If True, the existing metadata will be used. Defaults to False.
+        override_db (bool, optional): If True, existing records in db with the same path will be updated. Defaults to True.
+        store_metadata_file (bool, optional): If True, the recording metadata will be stored in a YAML file at the recording path. Defaults to True.
+        checksum_algorithm (str, optional): The algorithm used for the file checksums when generating metadata. Defaults to "sha256".
+        max_workers (int, optional): The number of processes the recording files are scanned in. Defaults to the number of CPUs.
+    Raises:
+        Exception: If there is an error writing a metadata file.
+    Returns:
+        None
+    """
+    time_added = time.time()
+
+    # the files of all recordings are scanned in one shared process pool,
+    # the recordings are handled in threads which mostly wait for their scans
+    max_workers = max_workers or os.cpu_count() or 1
+    # the pool starts its processes from one of the threads, so they are not forked
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mcap_utils.get_mp_context()
+    ) as scan_pool, ThreadPoolExecutor(
+        max_workers=max(min(len(recording_paths), max_workers), 1)
+    ) as executor:
+        all_metadata = list(
+            executor.map(
+                lambda recording_path: load_recording_metadata(
+                    recording_path,
+                    metadata_file_name=metadata_file_name,
+                    use_existing_metadata=use_existing_metadata,
+                    store_metadata_file=store_metadata_file,
+                    checksum_algorithm=checksum_algorithm,
+                    executor=scan_pool,
+                ),
+                recording_paths,
+            )
         )
-        database.truncate_database()  # clear the database
-        database.insert_multiple_records(sorted_records)  # insert sorted records
+
+    # look up existing recordings once instead of once per recording
+    existing_records = {
+        record.get("name"): record for record in database.get_all_records()
+    }
+
+    # recordings which are not in the database yet, by name
+    new_records = {}
+    for rec_metadata in all_metadata:
+        name = rec_metadata["name"]
+        existing_record = existing_records.get(name, new_records.get(name))
+        if existing_record is None:
+            rec_metadata["time_added"] = time_added
+            new_records[name] = rec_metadata
+            continue
+
+        # override existing entry in db
+        if not override_db:
+            continue
+        rec_metadata["time_added"] = _get_time_added(
+            existing_record, rec_metadata, time_added
+        )
+        if name in new_records:
+            # same recording twice in this batch, replace the pending record
+            new_records[name] = rec_metadata
+        else:
+            database.upsert_record(rec_metadata, "name", name)
+
+    if new_records:
+        database.insert_multiple_records(list(new_records.values()))
+    database.refresh()
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Calculate the great-circle distance between two points on the Earth's surface.
+    This function uses the Haversine formula to calculate the distance between two points
+    specified by their latitude and longitude in decimal degrees.
+    All arguments can also be NumPy arrays to calculate the distances element-wise.
+    Parameters:
+    lat1 (float): Latitude of the first point in decimal degrees.
+    lon1 (float): Longitude of the first point in decimal degrees.
+    lat2 (float): Latitude of the second point in decimal degrees.
+    lon2 (float): Longitude of the second point in decimal degrees.
+    Returns:
+    float: Distance between the two points in kilometers.
+    """
+    R = 6371.0  # Earth radius in kilometers
+    dlat = np.radians(lat2 - lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon / 2) ** 2
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
 
 
 def generate_map(recording_path, config, topic=None, speed=True, html_path=None):
@@ -269,7 +649,8 @@ def generate_map(recording_path, config, topic=None, speed=True, html_path=None)
     Generates an HTML map from GPS data in a recording.
     Args:
         recording_path (str): Path to  recording directory.
-        config (dict): Configuration dictionary containing necessary paths and settings.
+        config (Union[dict, str]): Configuration dictionary containing necessary paths and settings,
+                                   or the path to the config file.
         topic (str, optional): The specific topic to extract GPS data from. If None, the first topic of type
                                "sensor_msgs/msg/NavSatFix" will be used. Defaults to None.
         speed (bool, optional): If True, the speed of the vehicle will be calculated and displayed on the map. Defaults to True.
@@ -280,28 +661,8 @@ def generate_map(recording_path, config, topic=None, speed=True, html_path=None)
         None
     """
 
-    def haversine(lat1, lon1, lat2, lon2):
-        """
-        Calculate the great-circle distance between two points on the Earth's surface.
-        This function uses the Haversine formula to calculate the distance between two points
-        specified by their latitude and longitude in decimal degrees.
-        Parameters:
-        lat1 (float): Latitude of the first point in decimal degrees.
-        lon1 (float): Longitude of the first point in decimal degrees.
-        lat2 (float): Latitude of the second point in decimal degrees.
-        lon2 (float): Longitude of the second point in decimal degrees.
-        Returns:
-        float: Distance between the two points in kilometers.
-        """
-        R = 6371.0  # Earth radius in kilometers
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        a = (
-            sin(dlat / 2) ** 2
-            + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
-        )
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-        return R * c
+    if isinstance(config, str):
+        config = load_config(config)
 
     if not os.path.exists(recording_path):
         raise FileNotFoundError(f"The directory {recording_path} does not exist.")
@@ -345,34 +706,37 @@ def generate_map(recording_path, config, topic=None, speed=True, html_path=None)
     mcap_files = [os.path.join(recording_path, f["path"]) for f in metadata["files"]]
 
     gps_data = mcap_utils.read_msg_nav_sat_fix(mcap_files, topic)
-    if len(gps_data) == 0:
+    if len(gps_data["stamp"]) == 0:
         logging.warning("No NavSatFix messages found")
         return
 
     if speed:
-        velocities = []
-        for i in range(1, len(gps_data)):
-            lat1, lon1 = gps_data[i - 1]["latitude"], gps_data[i - 1]["longitude"]
-            lat2, lon2 = gps_data[i]["latitude"], gps_data[i]["longitude"]
-            distance = haversine(lat1, lon1, lat2, lon2)  # km
-            time_diff = (
-                gps_data[i]["stamp"] - gps_data[i - 1]["stamp"]
-            ) / 3600  # sec to h
-            velocity = distance / time_diff if time_diff > 0 else 0
-            velocities.append(velocity)
+        latitudes = gps_data["latitude"]
+        longitudes = gps_data["longitude"]
+        stamps = gps_data["stamp"]
+
+        # distances and time differences between consecutive samples
+        distances = haversine(
+            latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+        )  # km
+        time_diffs = np.diff(stamps) / 3600  # sec to h
+        velocities = np.zeros_like(distances)
+        np.divide(distances, time_diffs, out=velocities, where=time_diffs > 0)
 
         # apply median filter to remove outliers caused by time jumps
-        velocities = medfilt(velocities, kernel_size=9)
-
-        gps_data = [
-            {
-                "latitude": data["latitude"],
-                "longitude": data["longitude"],
-                "speed": vel,
-                "stamp": data["stamp"],
-            }
-            for data, vel in zip(gps_data, velocities)
-        ]
+        # (skipped if there are fewer samples than the kernel size)
+        if len(velocities) >= VELOCITY_FILTER_SIZE:
+            velocities = median_filter(
+                velocities, size=VELOCITY_FILTER_SIZE, mode="nearest"
+            )
+
+        # velocities are one sample shorter than the positions
+        gps_data = {
+            "latitude": latitudes[: len(velocities)],
+            "longitude": longitudes[: len(velocities)],
+            "speed": velocities,
+            "stamp": stamps[: len(velocities)],
+        }
 
     # generate and store html map
     if html_path is None:
@@ -397,7 +761,8 @@ def generate_video(
 
     Args:
         recording_path (str): Path to the recording directory.
-        config (dict): Configuration dictionary containing necessary paths and settings.
+        config (Union[dict, str]): Configuration dictionary containing necessary paths and settings,
+                                   or the path to the config file.
         topics (list of str, optional): List of topics to extract image data from. If None, all topics of type
                                          "sensor_msgs/msg/Image" or "sensor_msgs/msg/CompressedImage" will be used.
 
@@ -408,6 +773,9 @@ def generate_video(
         None
     """
 
+    if isinstance(config, str):
+        config = load_config(config)
+
     if not os.path.exists(recording_path):
         raise FileNotFoundError(f"The directory {recording_path} does not exist.")
 
@@ -435,13 +803,12 @@ def generate_video(
 
     mcap_files = [os.path.join(recording_path, f["path"]) for f in metadata["files"]]
 
+    video_topics = []
+    video_paths = []
     for topic in topics:
         topic_type = next(
             (t["type"] for t in metadata["topics"] if t["name"] == topic), None
         )
-        fps = next(
-            (t["frequency"] for t in metadata["topics"] if t["name"] == topic), None
-        )
         if topic_type not in types:
             logging.warning(f"Topic {topic} is not of type {types}")
             continue
@@ -450,15 +817,18 @@ def generate_video(
         video_path = os.path.join(recording_path, config["resources_folder"], file_name)
         os.makedirs(os.path.dirname(video_path), exist_ok=True)
 
-        mcap_utils.mcap_to_video(mcap_files, topic, video_path, fps)
+        video_topics.append(topic)
+        video_paths.append(video_path)
+
+    if len(video_topics) == 0:
+        return
 
-        # Compress video to H.264 with ffmpeg since OpenCV does only support it in manually compiled version
-        # https://github.com/opencv/opencv-python/issues/100#issuecomment-394159998
-        compressed_video_path = video_path.replace(".mp4", "_compressed.mp4")
-        command = f"ffmpeg -i {video_path} -vcodec libx264 {compressed_video_path}"
-        os.system(f"{command} > /dev/null 2>&1")
-        os.remove(video_path)
-        os.rename(compressed_video_path, video_path)
+    # decode all topics in a single pass over the mcap files, frames are encoded to H.264
+    # by ffmpeg since OpenCV does only support it in manually compiled version
+    # https://github.com/opencv/opencv-python/issues/100#issuecomment-394159998
+    # the frame rate is estimated from the image stamps since the topic frequency
+    # in the metadata is an average which includes gaps in the recording
+    mcap_utils.mcap_to_video(mcap_files, video_topics, video_paths)
 
 
 def compress_recording_image(
@@ -468,7 +838,8 @@ def compress_recording_image(
     Compresses sensor_msgs/msg/Image messages in a recording.
     Args:
         recording_path (str): Path to the recording directory.
-        config (dict): Configuration dictionary containing necessary paths and settings.
+        config (Union[dict, str]): Configuration dictionary containing necessary paths and settings,
+                                   or the path to the config file.
         compressed_suffix (str, optional): Suffix to identify compressed image topics. Defaults to "/compressed".
         remove_uncompressed (bool, optional): If True, uncompressed image topics will be removed after compression. Defaults to False.
     Raises:
@@ -477,6 +848,9 @@ def compress_recording_image(
     Returns:
         None
     """
+    if isinstance(config, str):
+        config = load_config(config)
+
     if not os.path.exists(recording_path):
         raise FileNotFoundError(f"The directory {recording_path} does not exist.")
 
@@ -527,7 +901,11 @@ def compress_recording_image(
         if os.path.exists(compressed_file):
             shutil.move(compressed_file, original_file)
         os.rmdir(compressed_folder)
-    generate_metadata(recording_path, config["metadata_file"])
+    generate_metadata(
+        recording_path,
+        config["metadata_file"],
+        checksum_algorithm=config.get("checksum_algorithm", "sha256"),
+    )
 
 
 def download_recording(
@@ -540,7 +918,7 @@ def download_recording(
         destination (str): Path to the destination directory where the recording files will be copied.
         metadata_file (str): Name of the metadata file in the source directory that contains information about the recording files.
         additional_files (list, optional): List of additional file names to copy from the source directory. Defaults to an empty list.
-        check_md5 (bool, optional): Whether to perform MD5 checksum validation for file integrity. Defaults to True.
+        check_md5 (bool, optional): Whether to perform checksum validation (MD5 or the algorithm stored in the metadata) for file integrity. Defaults to True.
     Returns:
         dict: A dictionary containing the download status of each file. Keys are file paths, and values are booleans indicating success (True) or failure (False).
     Raises:
@@ -574,20 +952,24 @@ def download_recording(
         shutil.copy(file_path, destination_path)
 
         if check_md5:
-            if "md5sum" not in file.keys():
+            # checksums are stored as <algorithm>sum, e.g. md5sum
+            checksum_key = next(
+                (k for k in file.keys() if k.endswith("sum") and k != "sum"), None
+            )
+            if checksum_key is None:
                 download_status[file["path"]] = True
                 logging.warning(
-                    f"No MD5 checksum found for {file_path}, skipping integrity check."
+                    f"No checksum found for {file_path}, skipping integrity check."
                 )
                 continue
 
             with open(os.path.join(destination_path, file["path"]), "rb") as f:
-                md5_sum_downloaded = hashlib.md5(f.read()).hexdigest()
+                checksum_downloaded = mcap_utils.hash_file(f, checksum_key[:-3])
 
-            if md5_sum_downloaded != file["md5sum"]:
+            if checksum_downloaded != file[checksum_key]:
                 download_status[file["path"]] = False
                 logging.error(
-                    f"MD5 checksum for {file_path} does not match, file may be corrupted."
+                    f"Checksum for {file_path} does not match, file may be corrupted."
                 )
 
         download_status[file["path"]] = True
@@ -1,4 +1,5 @@
 from bagman.utils.db.db_factory import get_db
+from bagman.utils.db.db_interface import AbstractBagmanDB
 
 
 class BagmanDB:
@@ -10,11 +11,12 @@ class BagmanDB:
         """
         Args:
             config (dict): Must contain:
-                - 'type': One of ['json', 'mongodb', 'elasticsearch']
+                - 'type': One of ['json', 'sqlite', 'mongodb', 'elasticsearch']
                 - 'uri': Path or connection string
         """
         self._backend = get_db(type, uri, name)
 
-    def __getattr__(self, name):
-        # delegate method calls to the backend
-        return getattr(self._backend, name)
+        # bind the backend methods once so calls are plain instance attribute lookups
+        for method_name in dir(AbstractBagmanDB):
+            if not method_name.startswith("_"):
+                setattr(self, method_name, getattr(self._backend, method_name))
@@ -1,5 +1,6 @@
 from bagman.utils.db.elasticsearch_backend import ElasticsearchBackend
 from bagman.utils.db.mongodb_backend import MongoDBBackend
+from bagman.utils.db.sqlite_backend import SQLiteBackend
 from bagman.utils.db.tinydb_backend import TinyDBBackend
 
 
@@ -11,5 +12,7 @@ def get_db(type, uri, name="bagman"):
         return MongoDBBackend(uri, db_name=name, collection=name)
     elif type == "elasticsearch":
         return ElasticsearchBackend(uri, index=name)
+    elif type == "sqlite":
+        return SQLiteBackend(uri, table=name)
     else:
         raise ValueError("unsupported backend type")
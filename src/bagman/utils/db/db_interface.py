@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 class AbstractBagmanDB(ABC):
     """
     Abstract interface for BagmanDB backends. All concrete database implementations
-    (e.g., TinyDB, MongoDB, Elasticsearch) must implement this interface.
+    (e.g., TinyDB, SQLite, MongoDB, Elasticsearch) must implement this interface.
     """
 
     @abstractmethod
@@ -25,6 +25,21 @@ class AbstractBagmanDB(ABC):
         """
         pass
 
+    def get_all_records_sorted(self, field, reverse=False):
+        """
+        Get all records from the database sorted by a field.
+        Args:
+            field (str): The field to sort the records by.
+            reverse (bool): If True, the records are sorted in descending order.
+        Returns:
+            list: A list of all records in the database.
+        """
+        records = self.get_all_records()
+        # records without a value for the field are kept last in both directions
+        missing = [x for x in records if x.get(field) is None]
+        records = [x for x in records if x.get(field) is not None]
+        return sorted(records, key=lambda x: x[field], reverse=reverse) + missing
+
     @abstractmethod
     def upsert_record(self, record, column_name, value):
         """
@@ -106,3 +121,17 @@ class AbstractBagmanDB(ABC):
             records (list): The list of records to insert.
         """
         pass
+
+    def refresh(self):
+        """
+        Make all previous writes visible to searches. Backends with immediate
+        visibility don't need to override this.
+        """
+        pass
+
+    def close(self):
+        """
+        Persist pending writes and release the database. Backends without local
+        state don't need to override this.
+        """
+        pass
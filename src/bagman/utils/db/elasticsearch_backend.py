@@ -1,30 +1,54 @@
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from elasticsearch import Elasticsearch, exceptions
 
 from bagman.utils.db.db_interface import AbstractBagmanDB
 
+# fields used for exact-value lookups, mapped as keyword when the index is created
+KEYWORD_FIELDS = ["name", "path"]
+
+# bulk request limits for insert_multiple_records
+BULK_CHUNK_SIZE = 1000
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+# bulk inserts with at least this many records disable index refreshes while running
+BULK_DISABLE_REFRESH_MIN_RECORDS = 10000
+
+# page size when scrolling through all records
+SCROLL_SIZE = 1000
+
+
+@lru_cache(maxsize=8)
+def _get_client(url, api_key=None, user=None, password=None):
+    # one client per connection so backend instances share the connection pool
+    if api_key is not None:
+        return Elasticsearch(url, api_key=api_key)
+    elif user is not None and password is not None:
+        return Elasticsearch(url, http_auth=(user, password))
+    return Elasticsearch(url)
+
 
 class ElasticsearchBackend(AbstractBagmanDB):
-    def __init__(self, url, index="bagman"):
+    def __init__(self, url, index="bagman", unique_field="name"):
         self.index = index
+        # documents are stored with the value of the unique field as _id
+        self.unique_field = unique_field
+        # resolved field names for exact-value queries (see _resolve_exact_field)
+        self._exact_fields = {}
+        # _id of documents not keyed by the unique field (see _get_legacy_ids)
+        self._legacy_ids = None
 
         # set up authentication
         try:
             load_dotenv()
-            if "DATABASE_TOKEN" in os.environ:
-                self.es = Elasticsearch(url, api_key=os.environ["DATABASE_TOKEN"])
-            elif "DATABASE_USER" in os.environ and "DATABASE_PASSWORD" in os.environ:
-                self.es = Elasticsearch(
-                    url,
-                    http_auth=(
-                        os.environ["DATABASE_USER"],
-                        os.environ["DATABASE_PASSWORD"],
-                    ),
-                )
-            else:
-                self.es = Elasticsearch(url)
+            self.es = _get_client(
+                url,
+                os.environ.get("DATABASE_TOKEN"),
+                os.environ.get("DATABASE_USER"),
+                os.environ.get("DATABASE_PASSWORD"),
+            )
         except Exception as e:
             raise ConnectionError(f"Failed to initialize Elasticsearch client: {e}")
 
@@ -33,7 +57,7 @@ class ElasticsearchBackend(AbstractBagmanDB):
         # ensure index exists
         try:
             if not self.es.indices.exists(index=self.index):
-                self.es.indices.create(index=self.index)
+                self._create_index()
         except exceptions.AuthorizationException as e:
             raise PermissionError(
                 f"Not authorized to access or create index '{self.index}': {e}"
@@ -41,6 +65,14 @@ class ElasticsearchBackend(AbstractBagmanDB):
         except Exception as e:
             raise RuntimeError(f"Failed to check or create index '{self.index}': {e}")
 
+    def _create_index(self):
+        # map key fields as keyword so term queries skip text analysis
+        keyword_fields = set(KEYWORD_FIELDS) | {self.unique_field}
+        mappings = {"properties": {f: {"type": "keyword"} for f in keyword_fields}}
+        self.es.indices.create(index=self.index, body={"mappings": mappings})
+        self._exact_fields = {}
+        self._legacy_ids = {}
+
     def is_connected(self):
         # check if the cluster is reachable
         try:
@@ -74,36 +106,73 @@ class ElasticsearchBackend(AbstractBagmanDB):
         return current
 
     def _resolve_exact_field(self, column_name):
+        if column_name in self._exact_fields:
+            return self._exact_fields[column_name]
+
         field_mapping = self._get_field_mapping(column_name)
         if not field_mapping:
-            # mapping not found; fallback to normal field name
+            # mapping not found (yet); fallback to normal field name without caching
             return column_name
 
+        exact_field = column_name
         if isinstance(field_mapping, dict):
             if field_mapping.get("type") == "text":
                 fields = field_mapping.get("fields", {})
                 if "keyword" in fields:
-                    return f"{column_name}.keyword"
-                else:
-                    return column_name
+                    exact_field = f"{column_name}.keyword"
             # For other types, return as is
-            if "type" in field_mapping:
-                return column_name
-            return column_name
-        return column_name
+
+        self._exact_fields[column_name] = exact_field
+        return exact_field
+
+    def _get_doc_id(self, record):
+        value = record.get(self.unique_field)
+        return str(value) if value is not None else None
 
     def get_all_records(self, timeout=10):
-        resp = self.es.search(
+        from elasticsearch.helpers import scan
+
+        # scroll through the whole index in _doc order instead of a single capped page
+        hits = scan(
+            self.es,
             index=self.index,
-            body={"query": {"match_all": {}}},
-            size=10000,
+            query={"query": {"match_all": {}}},
+            size=SCROLL_SIZE,
             request_timeout=timeout,
         )
-        return [doc["_source"] for doc in resp["hits"]["hits"]]
+        return [doc["_source"] for doc in hits]
+
+    def _get_legacy_ids(self):
+        # documents indexed before they were keyed by the unique field, looked up once
+        if self._legacy_ids is None:
+            from elasticsearch.helpers import scan
+
+            hits = scan(
+                self.es,
+                index=self.index,
+                query={"query": {"match_all": {}}, "_source": [self.unique_field]},
+                size=SCROLL_SIZE,
+            )
+            self._legacy_ids = {}
+            for doc in hits:
+                value = doc["_source"].get(self.unique_field)
+                if value is not None and doc["_id"] != str(value):
+                    self._legacy_ids[str(value)] = doc["_id"]
+        return self._legacy_ids
 
     def upsert_record(self, record, column_name, value):
+        if column_name == self.unique_field:
+            # update or insert by _id in a single request
+            doc_id = self._get_legacy_ids().get(str(value), str(value))
+            self.es.update(
+                index=self.index,
+                id=doc_id,
+                body={"doc": record, "doc_as_upsert": True},
+            )
+            return
+
         exact_field = self._resolve_exact_field(column_name)
-        query = {"query": {"term": {exact_field: {"value": value}}}}
+        query = {"query": {"term": {exact_field: {"value": value}}}, "_source": False}
         resp = self.es.search(index=self.index, body=query, size=1)
         hits = resp["hits"]["hits"]
 
@@ -113,20 +182,28 @@ class ElasticsearchBackend(AbstractBagmanDB):
             self.es.update(index=self.index, id=doc_id, body={"doc": record})
         else:
             # insert as a new record
-            self.es.index(index=self.index, body=record, refresh="wait_for")
+            self.es.index(index=self.index, id=self._get_doc_id(record), body=record)
 
     def insert_record(self, record):
-        self.es.index(index=self.index, body=record, refresh="wait_for")
+        self.es.index(index=self.index, id=self._get_doc_id(record), body=record)
 
     def contains_record(self, column_name, value):
         exact_field = self._resolve_exact_field(column_name)
-        query = {"query": {"term": {exact_field: {"value": value}}}}
-        resp = self.es.count(index=self.index, body=query)
-        return resp["count"] > 0
+        # stop at the first match instead of counting all of them
+        query = {
+            "query": {"term": {exact_field: {"value": value}}},
+            "terminate_after": 1,
+            "track_total_hits": 1,
+        }
+        resp = self.es.search(index=self.index, body=query, size=0)
+        return resp["hits"]["total"]["value"] > 0
 
     def get_record(self, column_name, value):
         exact_field = self._resolve_exact_field(column_name)
-        query = {"query": {"term": {exact_field: {"value": value}}}}
+        query = {
+            "query": {"term": {exact_field: {"value": value}}},
+            "terminate_after": 1,
+        }
         resp = self.es.search(index=self.index, body=query, size=1)
         hits = resp["hits"]["hits"]
         return hits[0]["_source"] if hits else None
@@ -142,12 +219,63 @@ class ElasticsearchBackend(AbstractBagmanDB):
         query = {"query": {"term": {exact_field: {"value": value}}}}
         self.es.delete_by_query(index=self.index, body=query)
 
+    def refresh(self):
+        self.es.indices.refresh(index=self.index)
+
     def truncate_database(self):
         self.es.indices.delete(index=self.index, ignore=[400, 404])
-        self.es.indices.create(index=self.index)
+        self._create_index()
 
     def insert_multiple_records(self, records, timeout=10):
-        from elasticsearch.helpers import bulk
+        from elasticsearch.helpers import parallel_bulk
 
-        actions = [{"_index": self.index, "_source": r} for r in records]
-        bulk(self.es, actions, request_timeout=timeout)
+        actions = []
+        for r in records:
+            action = {"_index": self.index, "_source": r}
+            doc_id = self._get_doc_id(r)
+            if doc_id is not None:
+                action["_id"] = doc_id
+            actions.append(action)
+
+        # disable refreshes during large bulk ingests and restore the setting afterwards
+        disable_refresh = len(actions) >= BULK_DISABLE_REFRESH_MIN_RECORDS
+        if disable_refresh:
+            settings = self.es.indices.get_settings(index=self.index)
+            refresh_interval = (
+                settings.get(self.index, {})
+                .get("settings", {})
+                .get("index", {})
+                .get("refresh_interval")
+            )
+            if refresh_interval == "-1":
+                # disabled by a concurrent or interrupted ingest, restore the default
+                refresh_interval = None
+            self.es.indices.put_settings(
+                index=self.index, body={"index": {"refresh_interval": "-1"}}
+            )
+
+        errors = []
+        try:
+            for ok, info in parallel_bulk(
+                self.es.options(request_timeout=timeout),
+                actions,
+                thread_count=os.cpu_count() or 4,
+                chunk_size=BULK_CHUNK_SIZE,
+                max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+                queue_size=4,
+                raise_on_error=False,
+            ):
+                if not ok:
+                    errors.append(info)
+        finally:
+            if disable_refresh:
+                self.es.indices.put_settings(
+                    index=self.index,
+                    body={"index": {"refresh_interval": refresh_interval}},
+                )
+            self.es.indices.refresh(index=self.index)
+
+        if errors:
+            raise RuntimeError(
+                f"Failed to insert {len(errors)} of {len(actions)} records: {errors[0]}"
+            )
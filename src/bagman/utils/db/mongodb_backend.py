@@ -1,35 +1,64 @@
+import logging
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 
 from bagman.utils.db.db_interface import AbstractBagmanDB
 
+# number of documents sent per insert_many round-trip
+INSERT_BATCH_SIZE = 1000
+
+# connection pool settings of the shared client
+POOL_OPTIONS = {"maxPoolSize": 20, "minPoolSize": 5, "maxIdleTimeMS": 60000}
+
+
+@lru_cache(maxsize=8)
+def _get_client(uri, user=None, password=None):
+    # one client per connection so backend instances share the pool and topology
+    if user is not None and password is not None:
+        return MongoClient(uri, username=user, password=password, **POOL_OPTIONS)
+    return MongoClient(uri, **POOL_OPTIONS)
+
 
 class MongoDBBackend(AbstractBagmanDB):
-    def __init__(self, uri, db_name="bagman", collection="bagman"):
+    def __init__(self, uri, db_name="bagman", collection="bagman", unique_field="name"):
         load_dotenv()
-        if "DATABASE_USER" in os.environ and "DATABASE_PASSWORD" in os.environ:
-            self.client = MongoClient(
-                uri,
-                username=os.environ["DATABASE_USER"],
-                password=os.environ["DATABASE_PASSWORD"],
-            )
-        else:
-            self.client = MongoClient(uri)
-
-        self.is_connected()
+        self.client = _get_client(
+            uri, os.environ.get("DATABASE_USER"), os.environ.get("DATABASE_PASSWORD")
+        )
 
         self.db = self.client[db_name]
         self.collection = self.db[collection]
 
+        self.is_connected()
+
+        self.unique_field = unique_field
+        self._ensure_index()
+
+    def _ensure_index(self):
+        # index the key used for lookups and upserts to avoid collection scans
+        try:
+            self.collection.create_index([(self.unique_field, 1)], unique=True)
+        except OperationFailure as e:
+            # e.g. existing duplicates or missing privileges, lookups still work without
+            logging.warning(
+                f"Could not create unique index on '{self.unique_field}': {e}"
+            )
+
     def is_connected(self):
         try:
-            # attempt to connect to the database
-            self.client.admin.command("ping")
+            # attempt to connect with a lightweight ping scoped to the database
+            self.db.command("ping")
         except Exception as e:
             if "Authentication failed" in str(e):
                 raise PermissionError("Authentication failed.") from e
+            if isinstance(e, OperationFailure):
+                raise PermissionError(
+                    f"Not authorized to access database '{self.db.name}'."
+                ) from e
             raise ConnectionError("MongoDB server not reachable.") from e
 
     def get_all_records(self):
@@ -57,4 +86,7 @@ class MongoDBBackend(AbstractBagmanDB):
         self.collection.delete_many({})
 
     def insert_multiple_records(self, records):
-        self.collection.insert_many(records)
+        # unordered inserts let the server process a batch in parallel
+        for start in range(0, len(records), INSERT_BATCH_SIZE):
+            end = start + INSERT_BATCH_SIZE
+            self.collection.insert_many(records[start:end], ordered=False)
@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from bagman.utils.db.db_interface import AbstractBagmanDB
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# fields of the records with an expression index, for lookups and sorting
+INDEXED_FIELDS = ["path", "start_time"]
+
+
+def _dumps(record):
+    if orjson is not None:
+        return orjson.dumps(record).decode()
+    return json.dumps(record)
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_field(field):
+    json_path = '$."' + field.replace('"', '""') + '"'
+    return "json_extract(record, '" + json_path.replace("'", "''") + "')"
+
+
+class SQLiteBackend(AbstractBagmanDB):
+    def __init__(self, database_path, table="bagman", unique_field="name"):
+        self.database_path = database_path
+        self.table = table
+        # the value of the unique field is stored in an indexed column for lookups
+        self.unique_field = unique_field
+
+        # like the TinyDB backend, a mistyped path is an error instead of a new database
+        if database_path != ":memory:" and not os.path.exists(database_path):
+            raise FileNotFoundError(
+                f"The database file at {database_path} does not exist."
+            )
+
+        # the dashboard calls the backend from different threads, they share the
+        # connection and take turns using it
+        self._lock = threading.RLock()
+        try:
+            self.conn = sqlite3.connect(database_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            with self.conn:
+                self.conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{self.table}" ('
+                    "id INTEGER PRIMARY KEY, key TEXT UNIQUE, record TEXT NOT NULL)"
+                )
+                for field in INDEXED_FIELDS:
+                    if field == self.unique_field:
+                        continue
+                    # the expression must match _json_field to be used by queries
+                    self.conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{self.table}_{field}" '
+                        f'ON "{self.table}" ({_json_field(field)})'
+                    )
+        except sqlite3.Error as e:
+            raise ConnectionError(
+                f"Failed to open SQLite database at {database_path}: {e}"
+            )
+
+        self.is_connected()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if getattr(self, "conn", None) is not None:
+            with self._lock:
+                self.conn.close()
+                self.conn = None
+
+    @contextmanager
+    def _transaction(self):
+        # the statements of a call are committed or rolled back together
+        try:
+            with self._lock, self.conn:
+                yield
+        except sqlite3.IntegrityError as e:
+            raise RuntimeError(
+                f"A record with the same {self.unique_field} already exists in the "
+                f"database: {e}"
+            ) from e
+
+    def _fetch(self, query, parameters=()):
+        with self._lock:
+            return self.conn.execute(query, parameters).fetchall()
+
+    def _where(self, column_name):
+        # records are stored as JSON, other fields are matched with json_extract
+        if column_name == self.unique_field:
+            return "key = ?"
+        return f"{_json_field(column_name)} = ?"
+
+    def _get_key(self, record):
+        value = record.get(self.unique_field)
+        return str(value) if value is not None else None
+
+    def is_connected(self):
+        try:
+            self._fetch("SELECT 1")
+        except sqlite3.Error as e:
+            raise ConnectionError(
+                f"SQLite database at {self.database_path} not accessible."
+            ) from e
+
+    def get_all_records(self):
+        rows = self._fetch(f'SELECT record FROM "{self.table}" ORDER BY id')
+        return [_loads(row[0]) for row in rows]
+
+    def get_all_records_sorted(self, field, reverse=False):
+        order = "DESC" if reverse else "ASC"
+        rows = self._fetch(
+            f'SELECT record FROM "{self.table}" '
+            f"ORDER BY {_json_field(field)} IS NULL, {_json_field(field)} {order}, "
+            f"id {order}"
+        )
+        return [_loads(row[0]) for row in rows]
+
+    def upsert_record(self, record, column_name, value):
+        with self._transaction():
+            rows = self.conn.execute(
+                f'SELECT id, record FROM "{self.table}" WHERE {self._where(column_name)}',
+                (value,),
+            ).fetchall()
+
+            if not rows:
+                self.conn.execute(
+                    f'INSERT INTO "{self.table}" (key, record) VALUES (?, ?)',
+                    (self._get_key(record), _dumps(record)),
+                )
+                return
+
+            # update the matched records with the fields of the new record
+            updates = []
+            for row_id, data in rows:
+                updated_record = _loads(data)
+                updated_record.update(record)
+                updates.append(
+                    (self._get_key(updated_record), _dumps(updated_record), row_id)
+                )
+            self.conn.executemany(
+                f'UPDATE "{self.table}" SET key = ?, record = ? WHERE id = ?', updates
+            )
+
+    def insert_record(self, record):
+        with self._transaction():
+            self.conn.execute(
+                f'INSERT INTO "{self.table}" (key, record) VALUES (?, ?)',
+                (self._get_key(record), _dumps(record)),
+            )
+
+    def contains_record(self, column_name, value):
+        rows = self._fetch(
+            f'SELECT 1 FROM "{self.table}" WHERE {self._where(column_name)} LIMIT 1',
+            (value,),
+        )
+        return len(rows) > 0
+
+    def get_record(self, column_name, value):
+        rows = self._fetch(
+            f'SELECT record FROM "{self.table}" WHERE {self._where(column_name)} '
+            "ORDER BY id LIMIT 1",
+            (value,),
+        )
+        return _loads(rows[0][0]) if rows else None
+
+    def search_record(self, column_name, value):
+        rows = self._fetch(
+            f'SELECT record FROM "{self.table}" WHERE {self._where(column_name)} '
+            "ORDER BY id",
+            (value,),
+        )
+        return [_loads(row[0]) for row in rows]
+
+    def remove_record(self, column_name, value):
+        with self._transaction():
+            self.conn.execute(
+                f'DELETE FROM "{self.table}" WHERE {self._where(column_name)}',
+                (value,),
+            )
+
+    def truncate_database(self):
+        with self._transaction():
+            self.conn.execute(f'DELETE FROM "{self.table}"')
+
+    def insert_multiple_records(self, records):
+        with self._transaction():
+            self.conn.executemany(
+                f'INSERT INTO "{self.table}" (key, record) VALUES (?, ?)',
+                ((self._get_key(record), _dumps(record)) for record in records),
+            )
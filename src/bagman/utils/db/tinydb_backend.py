@@ -1,19 +1,113 @@
 import os
+from collections import Counter
+from functools import lru_cache
 
 from tinydb import Query, TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
 
 from bagman.utils.db.db_interface import AbstractBagmanDB
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# fields with an in-memory index of their values for contains_record
+INDEXED_FIELDS = ["name", "path"]
+
+
+@lru_cache(maxsize=32)
+def _field(name):
+    # field accessors only depend on the name, reuse them so query hashes match
+    return Query()[name]
+
+
+class ORJSONStorage(JSONStorage):
+    """
+    JSON file storage which uses orjson to read and write the database file.
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, access_mode="rb+", **kwargs)
+
+    def read(self):
+        self._handle.seek(0, os.SEEK_END)
+        if not self._handle.tell():
+            # empty file, let TinyDB initialize the database
+            return None
+        self._handle.seek(0)
+        return orjson.loads(self._handle.read())
+
+    def write(self, data):
+        self._handle.seek(0)
+        self._handle.write(orjson.dumps(data))
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        # remove leftovers in case the file got shorter
+        self._handle.truncate()
+
 
 class TinyDBBackend(AbstractBagmanDB):
+    """
+    TinyDB backend which keeps the database in memory for reads. Every mutating call writes
+    the database to the file right away, and the file is read again whenever another
+    process has changed it.
+    """
+
     def __init__(self, database_path):
         self.database_path = database_path
         self.is_connected()
-        self.db = TinyDB(database_path)
+        self.db = None
+        # modification time and size of the file when it was last read or written
+        self._file_state = None
+        # number of records per value of the indexed fields
+        self._index = {field: Counter() for field in INDEXED_FIELDS}
+        self._reload()
 
     def __del__(self):
-        if hasattr(self, "db") and self.db is not None:
+        self.close()
+
+    def close(self):
+        if getattr(self, "db", None) is not None:
+            self.db.close()
+            self.db = None
+
+    def refresh(self):
+        self._reload()
+
+    def _get_file_state(self):
+        st = os.stat(self.database_path)
+        return st.st_mtime_ns, st.st_size
+
+    def _reload(self):
+        # reopen the database if the file was changed by another process
+        file_state = self._get_file_state()
+        if self.db is not None and file_state == self._file_state:
+            return
+        if self.db is not None:
             self.db.close()
+        storage = ORJSONStorage if orjson is not None else JSONStorage
+        self.db = TinyDB(self.database_path, storage=CachingMiddleware(storage))
+        self._file_state = file_state
+        # rebuild the index from the records in the file
+        for values in self._index.values():
+            values.clear()
+        self._index_records(self.db.all(), 1)
+
+    def _flush(self):
+        # write the changes to the file so other processes see them
+        self.db.storage.flush()
+        self._file_state = self._get_file_state()
+
+    def _index_records(self, records, count):
+        for record in records:
+            for field, values in self._index.items():
+                value = record.get(field)
+                if isinstance(value, str):
+                    values[value] += count
+                    if values[value] <= 0:
+                        del values[value]
 
     def is_connected(self):
         if not os.path.exists(self.database_path):
@@ -22,33 +116,54 @@ class TinyDBBackend(AbstractBagmanDB):
             )
 
     def get_all_records(self):
+        self._reload()
         return self.db.all()
 
     def upsert_record(self, record, column_name, value):
-        query = Query()[column_name] == value
-        self.db.upsert(record, query)
+        self._reload()
+        query = _field(column_name) == value
+        self._index_records(self.db.search(query), -1)
+        doc_ids = self.db.upsert(record, query)
+        self._index_records(self.db.get(doc_ids=doc_ids), 1)
+        self._flush()
 
     def insert_record(self, record):
+        self._reload()
         self.db.insert(record)
+        self._index_records([record], 1)
+        self._flush()
 
     def contains_record(self, column_name, value):
-        query = Query()[column_name] == value
-        return self.db.contains(query)
+        self._reload()
+        if column_name in self._index and isinstance(value, str):
+            return value in self._index[column_name]
+        return self.db.contains(_field(column_name) == value)
 
     def get_record(self, column_name, value):
-        query = Query()[column_name] == value
-        return self.db.get(query)
+        self._reload()
+        return self.db.get(_field(column_name) == value)
 
     def search_record(self, column_name, value):
-        query = Query()[column_name] == value
-        return self.db.search(query)
+        self._reload()
+        return self.db.search(_field(column_name) == value)
 
     def remove_record(self, column_name, value):
-        query = Query()[column_name] == value
+        self._reload()
+        query = _field(column_name) == value
+        self._index_records(self.db.search(query), -1)
         self.db.remove(query)
+        self._flush()
 
     def truncate_database(self):
+        self._reload()
         self.db.truncate()
+        for values in self._index.values():
+            values.clear()
+        self._flush()
 
     def insert_multiple_records(self, records):
+        self._reload()
+        records = list(records)
         self.db.insert_multiple(records)
+        self._index_records(records, 1)
+        self._flush()
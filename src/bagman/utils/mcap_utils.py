@@ -1,26 +1,297 @@
 import copy
-import glob
 import hashlib
+import json
+import logging
+import mmap
+import multiprocessing
 import os
+import shutil
+import struct
+import subprocess
+import threading
 import time
-from collections import defaultdict
-from typing import Any, Dict
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
+from mcap.opcode import Opcode
 from mcap.reader import make_reader
 from mcap_ros2.decoder import DecoderFactory
 from mcap_ros2.writer import Writer as McapWriter
 
 from bagman.utils.schema_ros import schema_ros
 
+try:
+    from blake3 import blake3
+except ImportError:  # blake3 is optional
+    blake3 = None
 
-def get_mcap_info(file: str) -> Dict[str, Any]:
+try:
+    import xxhash
+except ImportError:  # xxhash is optional
+    xxhash = None
+
+try:
+    from turbojpeg import TJPF_BGR, TJSAMP_420, TurboJPEG
+except ImportError:  # PyTurboJPEG is optional
+    TurboJPEG = None
+
+# OpenCV parallelizes single calls internally, which oversubscribes the CPU when frames
+# are already processed in parallel, set BAGMAN_OUTER_PARALLEL=1 to limit it to one thread
+if os.environ.get("BAGMAN_OUTER_PARALLEL") == "1":
+    cv2.setNumThreads(1)
+
+# block size used to stream files through the hash function
+HASH_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# sidecar file in the recording directory caching the per-file info of get_rec_info
+REC_INFO_CACHE_FILE = ".bagman_cache.json"
+
+# number of files whose channel info is kept in memory by get_mcap_info
+MCAP_INFO_CACHE_SIZE = 128
+
+# recordings with fewer files to scan are scanned in threads instead of processes
+PROCESS_POOL_MIN_FILES = 4
+
+# number of files hashed at the same time, hashing is bound by storage bandwidth
+HASH_WORKERS = 4
+
+# minimum number of messages buffered by compress_image while images are encoded
+COMPRESS_BATCH_SIZE = 32
+
+# number of frames whose stamps are used to estimate the frame rate of a video
+FPS_ESTIMATE_FRAMES = 30
+
+# frame rate of videos with too few frames to estimate it
+DEFAULT_VIDEO_FPS = 30.0
+
+# H.264 hardware encoders tried by mcap_to_video before falling back to libx264
+HW_VIDEO_ENCODERS = ["h264_nvenc", "h264_qsv", "h264_videotoolbox"]
+
+
+def hash_file(f, algorithm: str = "sha256") -> str:
+    """
+    Computes the checksum of a file without loading it into memory at once. Files on disk
+    are memory-mapped and hashed without copying them into Python buffers.
+
+    Args:
+        f (BinaryIO): The file object opened in binary mode.
+        algorithm (str): The name of a hashlib algorithm, "blake3" or an xxhash algorithm
+            (e.g. "xxh3_128"). Defaults to "sha256".
+
+    Returns:
+        str: The hexadecimal digest of the file content.
+    """
+    if algorithm == "blake3":
+        # multithreaded SIMD hashing of the memory-mapped file
+        h = _new_hasher(algorithm)
+        h.update_mmap(f.name)
+        return h.hexdigest()
+
+    try:
+        size = os.fstat(f.fileno()).st_size
+    except (AttributeError, OSError):
+        # in-memory file object
+        size = 0
+    if size > 0:
+        # hash the pages of the file directly instead of copying them into buffers
+        h = _new_hasher(algorithm)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):  # not available on Windows
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                for offset in range(0, len(mm), HASH_BUFFER_SIZE):
+                    end = offset + HASH_BUFFER_SIZE
+                    h.update(view[offset:end])
+        return h.hexdigest()
+
+    if algorithm.startswith("xxh") or not hasattr(hashlib, "file_digest"):
+        h = _new_hasher(algorithm)
+        for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
+    return hashlib.file_digest(f, algorithm).hexdigest()  # Python 3.11+
+
+
+def _new_hasher(algorithm: str = "sha256"):
+    """
+    Creates an incremental hash object for a checksum algorithm (see hash_file).
+
+    Args:
+        algorithm (str): The name of the checksum algorithm.
+
+    Returns:
+        Any: A hash object with update() and hexdigest().
+    """
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ImportError("The blake3 package is required for blake3 checksums.")
+        return blake3(max_threads=blake3.AUTO)
+    if algorithm.startswith("xxh"):
+        if xxhash is None:
+            raise ImportError("The xxhash package is required for xxhash checksums.")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+class HashingReader:
+    """
+    Wraps a binary file and feeds all bytes read through it into a hash object, so a file
+    can be hashed in the same pass in which it is parsed. It is not seekable, so readers
+    consume the file strictly in order.
+    """
+
+    def __init__(self, f, hasher):
+        self._f = f
+        self._hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self._hasher.update(data)
+        return data
+
+    def seekable(self) -> bool:
+        return False
+
+    def hexdigest(self) -> str:
+        # hash the rest of the file which has not been read
+        for chunk in iter(lambda: self._f.read(HASH_BUFFER_SIZE), b""):
+            self._hasher.update(chunk)
+        return self._hasher.hexdigest()
+
+
+def get_mp_context():
+    """
+    Returns the multiprocessing context for the scan process pools. The pools are started
+    while other threads are running, forking then can deadlock the child processes.
+
+    Returns:
+        multiprocessing.context.BaseContext: The "forkserver" context, or "spawn" where it
+            is not available (e.g. Windows).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _advise(f, advice: str) -> None:
+    """
+    Hints the kernel how a file is going to be read, to tune its read-ahead.
+
+    Args:
+        f (BinaryIO): The file object.
+        advice (str): "sequential" for linear scans, "random" for summary and index lookups.
+    """
+    if hasattr(os, "posix_fadvise"):  # not available on Windows and macOS
+        os.posix_fadvise(
+            f.fileno(),
+            0,
+            0,
+            os.POSIX_FADV_SEQUENTIAL
+            if advice == "sequential"
+            else os.POSIX_FADV_RANDOM,
+        )
+
+
+def _get_channel_info_from_summary(
+    f, summary, topics: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Collects the channel info of an MCAP file from its summary section and the message
+    index records, without decompressing any chunk.
+
+    Args:
+        f (BinaryIO): The MCAP file opened in binary mode.
+        summary (Summary): The summary of the file, may be None.
+        topics (List[str], optional): The topics to collect the info of, defaults to all topics.
+
+    Returns:
+        dict: The channel info (see get_mcap_info) or None if the file has no complete
+            summary or message indexes.
+    """
+    if summary is None or summary.statistics is None or not summary.chunk_indexes:
+        return None
+
+    channel_info: Dict[str, Dict[str, Any]] = {}
+    num_indexed = 0
+
+    for chunk_index in summary.chunk_indexes:
+        if chunk_index.message_index_length == 0:
+            # chunk without message indexes
+            return None
+
+        # the message indexes of a chunk directly follow the chunk record
+        index_start = chunk_index.chunk_start_offset + chunk_index.chunk_length
+        f.seek(index_start)
+        data = f.read(chunk_index.message_index_length)
+
+        for channel_id, offset in chunk_index.message_index_offsets.items():
+            # record layout: opcode (1), length (8), channel_id (2), records_length (4)
+            pos = offset - index_start
+            if data[pos] != Opcode.MESSAGE_INDEX:
+                return None
+            (records_length,) = struct.unpack_from("<I", data, pos + 11)
+            channel = summary.channels[channel_id]
+            if topics is not None and channel.topic not in topics:
+                # only counted to check that the indexes are complete
+                num_indexed += records_length // 16
+                continue
+            # records are (log_time, offset) pairs of uint64
+            log_times = np.frombuffer(
+                data, dtype="<u8", count=records_length // 8, offset=pos + 15
+            )[::2]
+            if log_times.size == 0:
+                continue
+
+            schema = summary.schemas.get(channel.schema_id)
+            start_time = int(log_times.min()) / 1e9
+            end_time = int(log_times.max()) / 1e9
+            num_indexed += log_times.size
+
+            info = channel_info.setdefault(
+                channel.topic,
+                {
+                    "num_messages": 0,
+                    "message_type": None,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "frequency": None,
+                },
+            )
+            info["num_messages"] += int(log_times.size)
+            info["message_type"] = schema.name if schema is not None else None
+            info["start_time"] = min(info["start_time"], start_time)
+            info["end_time"] = max(info["end_time"], end_time)
+
+    if num_indexed != summary.statistics.message_count:
+        # messages outside of chunks are not covered by the indexes
+        return None
+
+    return channel_info
+
+
+def get_mcap_info(file: str, topics: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Extracts and returns information about the channels in an MCAP file.
+    The information is read from the summary section and the message indexes if the file
+    has them, otherwise all messages are scanned in file order without decoding them.
+    The result is cached in memory until the size or modification time of the file changes.
 
     Args:
         file (str): The path to the MCAP file.
+        topics (List[str], optional): The topics to collect the info of, defaults to all topics.
+            Messages of other topics are skipped if the file has to be scanned.
 
     Returns:
         dict: A dictionary where the keys are channel topics and the values are dictionaries containing:
@@ -30,44 +301,249 @@ def get_mcap_info(file: str) -> Dict[str, Any]:
             - end_time (float): The timestamp of the last message in the channel (in seconds).
             - frequency (float): The frequency of messages in the channel (messages per second).
     """
-    with open(file, "rb") as f:
-        reader = make_reader(f)
-
-        channel_info: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {
-                "num_messages": 0,
-                "message_type": None,
-                "start_time": None,
-                "end_time": None,
-                "frequency": None,
-            }
+    # the file is only read again if its size or modification time changed
+    st = os.stat(file)
+    return copy.deepcopy(
+        _get_mcap_info_cached(
+            os.path.abspath(file),
+            st.st_mtime_ns,
+            st.st_size,
+            tuple(topics) if topics is not None else None,
         )
+    )
 
-        for schema, channel, message in reader.iter_messages():
-            info = channel_info[channel.topic]
-            info["num_messages"] += 1
-            info["message_type"] = schema.name
-            timestamp = message.log_time / 1e9 if message.log_time is not None else 0
-            if info["start_time"] is None or timestamp < info["start_time"]:
-                info["start_time"] = timestamp
-            if info["end_time"] is None or timestamp > info["end_time"]:
-                info["end_time"] = timestamp
-
-        for info in channel_info.values():
-            duration = (info["end_time"] or 0) - (info["start_time"] or 0)
-            info["frequency"] = (
-                info["num_messages"] / duration if duration > 0 else None
-            )
 
+@lru_cache(maxsize=MCAP_INFO_CACHE_SIZE)
+def _get_mcap_info_cached(
+    file: str, mtime_ns: int, size: int, topics: Optional[Tuple[str, ...]]
+) -> Dict[str, Any]:
+    with open(file, "rb") as f:
+        channel_info, _ = _read_mcap_info(f, topics=topics)
     return channel_info
 
 
-def get_rec_info(recording_path: str, recursive: bool = False) -> Dict[str, Any]:
+def _read_mcap_info(
+    f, checksum_algorithm: Optional[str] = None, topics: Optional[List[str]] = None
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Reads the channel info of an MCAP file (see get_mcap_info). If the file has no usable
+    summary and all messages have to be scanned, the file can be hashed in the same pass.
+
+    Args:
+        f (BinaryIO): The MCAP file opened in binary mode.
+        checksum_algorithm (str, optional): The algorithm to hash the file with while scanning.
+        topics (List[str], optional): The topics to collect the info of, defaults to all topics.
+
+    Returns:
+        Tuple[Dict[str, Any], Optional[str]]: The channel info and the checksum, or None if the
+            file has not been hashed.
+    """
+    checksum = None
+    _advise(f, "random")
+    reader = make_reader(f)
+
+    # read the counts and time ranges from the summary and message indexes
+    channel_info = _get_channel_info_from_summary(f, reader.get_summary(), topics)
+
+    if channel_info is None:
+        # no usable summary; scan all messages
+        _advise(f, "sequential")
+        stream = None
+        if checksum_algorithm is not None:
+            # read the file as a stream from the start, hashing it on the way
+            f.seek(0)
+            stream = HashingReader(f, _new_hasher(checksum_algorithm))
+            reader = make_reader(stream)
+
+        # collect the log times per channel, they are reduced with numpy after the scan
+        log_times = {}
+        channels = {}
+        for schema, channel, message in reader.iter_messages(
+            topics=topics, log_time_order=False
+        ):
+            times = log_times.get(channel.id)
+            if times is None:
+                times = log_times[channel.id] = array("q")
+                channels[channel.id] = (channel.topic, schema.name)
+            times.append(message.log_time)
+
+        channel_info = {}
+        for channel_id, times in log_times.items():
+            topic, schema_name = channels[channel_id]
+            times = np.frombuffer(times, dtype=np.int64)
+            start_time = int(times.min()) / 1e9
+            end_time = int(times.max()) / 1e9
+            info = channel_info.get(topic)
+            if info is None:
+                channel_info[topic] = {
+                    "num_messages": len(times),
+                    "message_type": schema_name,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "frequency": None,
+                }
+                continue
+            # several channels can share a topic
+            info["num_messages"] += len(times)
+            info["message_type"] = schema_name
+            info["start_time"] = min(info["start_time"], start_time)
+            info["end_time"] = max(info["end_time"], end_time)
+
+        if stream is not None:
+            checksum = stream.hexdigest()
+
+    for info in channel_info.values():
+        duration = (info["end_time"] or 0) - (info["start_time"] or 0)
+        info["frequency"] = info["num_messages"] / duration if duration > 0 else None
+
+    # plain dict, the channel info is passed between processes
+    return dict(channel_info), checksum
+
+
+def _scan_file(
+    file_path: str, checksum_algorithm: str = "sha256"
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Reads the channel info of an MCAP file and hashes it in the same pass if all messages
+    have to be scanned (see _read_mcap_info).
+    """
+    with open(file_path, "rb") as f:
+        return _read_mcap_info(f, checksum_algorithm)
+
+
+def _get_file_checksum(file_path: str, checksum_algorithm: str = "sha256") -> str:
+    """
+    Calculates the checksum of a file.
+
+    Args:
+        file_path (str): The path to the file.
+        checksum_algorithm (str): The algorithm used for the file checksum.
+
+    Returns:
+        str: The checksum of the file.
+    """
+    with open(file_path, "rb") as f:
+        _advise(f, "sequential")
+        return hash_file(f, checksum_algorithm)
+
+
+def _get_file_info(
+    file_path: str,
+    recording_path: str,
+    mcap_info: Dict[str, Any],
+    checksum_algorithm: str,
+    checksum: str,
+    size: int,
+) -> Dict[str, Any]:
+    """
+    Builds the file info of a single .mcap file of a recording.
+
+    Args:
+        file_path (str): The path to the MCAP file.
+        recording_path (str): The recording directory path the file belongs to.
+        mcap_info (dict): The channel info of the file (see get_mcap_info).
+        checksum_algorithm (str): The algorithm used for the file checksum.
+        checksum (str): The checksum of the file.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        Dict[str, Any]: The file info.
+    """
+    # file time range over all channels in a single pass
+    file_start_time = None
+    file_end_time = None
+    for info in mcap_info.values():
+        start_time, end_time = info["start_time"], info["end_time"]
+        if file_start_time is None or start_time < file_start_time:
+            file_start_time = start_time
+        if file_end_time is None or end_time > file_end_time:
+            file_end_time = end_time
+    relative_file_path = os.path.relpath(file_path, recording_path)
+    return {
+        "path": relative_file_path,
+        "start_time": file_start_time,
+        "end_time": file_end_time,
+        "duration": file_end_time - file_start_time,
+        f"{checksum_algorithm}sum": checksum,
+        "size": size,
+    }
+
+
+def _load_rec_info_cache(cache_file: str) -> Dict[str, Any]:
+    """
+    Loads the per-file info cache of a recording, returns an empty cache if it is missing or invalid.
+    """
+    try:
+        with open(cache_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_rec_info_cache(cache_file: str, cache: Dict[str, Any]) -> None:
+    """
+    Saves the per-file info cache of a recording, a read-only recording directory is not an error.
+    """
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logging.warning(f"Could not write cache file {cache_file}: {e}")
+
+
+def _find_mcap_files(
+    recording_path: str, recursive: bool = False
+) -> Dict[str, os.stat_result]:
+    """
+    Lists the .mcap files in a recording directory.
+
+    Args:
+        recording_path (str): The recording directory path.
+        recursive (bool): If True, subdirectories are searched as well.
+
+    Returns:
+        Dict[str, os.stat_result]: The stat results of the .mcap files by path, sorted by path.
+    """
+    # the directory entries already tell files and directories apart, only the
+    # .mcap files themselves are stat'ed
+    mcap_files = {}
+    directories = [recording_path]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".mcap") and entry.is_file():
+                        mcap_files[entry.path] = entry.stat()
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return dict(sorted(mcap_files.items()))
+
+
+def get_rec_info(
+    recording_path: str,
+    recursive: bool = False,
+    checksum_algorithm: str = "sha256",
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
     """
     Collects and merges information from all .mcap files in the specified directory path.
 
     Args:
         recording_path (str): The recording directory path to search for .mcap files.
+        recursive (bool): If True, .mcap files in subdirectories are included as well.
+        checksum_algorithm (str): The algorithm used for the file checksums, e.g. "sha256", "md5" or "blake3".
+        max_workers (int, optional): The number of files scanned in parallel processes. Defaults to the number of
+                                     CPUs. At most HASH_WORKERS of them are hashed at the same time, use 1 for
+                                     storage where concurrent reads are slow (e.g. HDDs).
+        use_cache (bool): If True, files whose size and modification time did not change are not processed again
+                          but taken from the cache file in the recording directory. Defaults to True.
+        executor (Executor, optional): A process pool to scan the files in, e.g. shared by several recordings.
+                                       If None, a pool with max_workers processes is created for this call,
+                                       or threads if fewer than PROCESS_POOL_MIN_FILES files have to be scanned.
 
     Returns:
         Dict[str, Any]: A dictionary containing merged information about the recordings, including:
@@ -82,7 +558,7 @@ def get_rec_info(recording_path: str, recursive: bool = False) -> Dict[str, Any]
                 - start_time (float): The start time of the file.
                 - end_time (float): The end time of the file.
                 - duration (float): The duration of the file.
-                - md5sum (str): The MD5 checksum of the file.
+                - <checksum_algorithm>sum (str): The checksum of the file, e.g. sha256sum.
                 - size (int): The size of the file.
             - topics (List[Dict[str, Any]]): Information about each topic, including:
                 - name (str): The name of the topic.
@@ -93,9 +569,7 @@ def get_rec_info(recording_path: str, recursive: bool = False) -> Dict[str, Any]
                 - frequency (float): The frequency of messages in the topic.
                 - duration (float): The duration of the topic.
     """
-    mcap_files = sorted(
-        glob.glob(os.path.join(recording_path, "*.mcap"), recursive=recursive)
-    )
+    mcap_files = _find_mcap_files(recording_path, recursive)
 
     if len(mcap_files) == 0:
         return {}
@@ -112,27 +586,97 @@ def get_rec_info(recording_path: str, recursive: bool = False) -> Dict[str, Any]
         "topics": {},
     }
 
-    for file_path in mcap_files:
-        mcap_info = get_mcap_info(file_path)
-
-        # calculate file md5sum and size
-        with open(file_path, "rb") as f:
-            md5sum = hashlib.md5(f.read()).hexdigest()
-        size = os.path.getsize(file_path)  # size in bytes
-
-        # add file info
-        file_start_time = min(info["start_time"] for info in mcap_info.values())
-        file_end_time = max(info["end_time"] for info in mcap_info.values())
-        file_duration = file_end_time - file_start_time
-        relative_file_path = os.path.relpath(file_path, recording_path)
-        merged_info["files"][relative_file_path] = {
-            "path": relative_file_path,
-            "start_time": file_start_time,
-            "end_time": file_end_time,
-            "duration": file_duration,
-            "md5sum": md5sum,
-            "size": size,
-        }
+    # reuse the info of unchanged files from the cache
+    cache_file = os.path.join(recording_path, REC_INFO_CACHE_FILE)
+    cache = _load_rec_info_cache(cache_file) if use_cache else {}
+    checksum_key = f"{checksum_algorithm}sum"
+    cached_results = {}
+    for file_path, st in mcap_files.items():
+        entry = cache.get(os.path.relpath(file_path, recording_path))
+        if (
+            entry is not None
+            and entry["size"] == st.st_size
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and checksum_key in entry["file_info"]
+        ):
+            cached_results[file_path] = (entry["file_info"], entry["mcap_info"])
+    uncached_files = [f for f in mcap_files if f not in cached_results]
+
+    # files are independent; scanning is CPU-bound Python code and runs in processes,
+    # hashing releases the GIL and runs in a separate, smaller thread pool next to it
+    mcap_infos = {}
+    checksums = {}
+    if uncached_files:
+        if max_workers is None:
+            max_workers = min(len(uncached_files), os.cpu_count() or 1)
+        hash_workers = min(HASH_WORKERS, max_workers)
+        if executor is not None:
+            scan_context = nullcontext(executor)
+        elif len(uncached_files) < PROCESS_POOL_MIN_FILES:
+            # starting processes costs more than it saves for a few files
+            scan_context = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            scan_context = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=get_mp_context()
+            )
+        with scan_context as scan_pool, ThreadPoolExecutor(
+            max_workers=hash_workers
+        ) as hash_pool:
+            scan_futures = {
+                scan_pool.submit(_scan_file, file_path, checksum_algorithm): file_path
+                for file_path in uncached_files
+            }
+            hash_futures = {}
+            # files which had to be scanned completely are hashed in the same pass,
+            # the others are hashed as soon as their summary has been read
+            for future in as_completed(scan_futures):
+                file_path = scan_futures[future]
+                mcap_infos[file_path], checksum = future.result()
+                if checksum is None:
+                    hash_futures[file_path] = hash_pool.submit(
+                        _get_file_checksum, file_path, checksum_algorithm
+                    )
+                else:
+                    checksums[file_path] = checksum
+            for file_path, future in hash_futures.items():
+                checksums[file_path] = future.result()
+
+    computed_results = {}
+    for file_path in uncached_files:
+        file_info = _get_file_info(
+            file_path,
+            recording_path,
+            mcap_infos[file_path],
+            checksum_algorithm,
+            checksums[file_path],
+            mcap_files[file_path].st_size,
+        )
+        computed_results[file_path] = (file_info, mcap_infos[file_path])
+
+    results = [
+        cached_results.get(file_path) or computed_results[file_path]
+        for file_path in mcap_files
+    ]
+
+    if use_cache and computed_results:
+        _save_rec_info_cache(
+            cache_file,
+            {
+                file_info["path"]: {
+                    "size": mcap_files[file_path].st_size,
+                    "mtime_ns": mcap_files[file_path].st_mtime_ns,
+                    "file_info": file_info,
+                    "mcap_info": mcap_info,
+                }
+                for file_path, (file_info, mcap_info) in zip(mcap_files, results)
+            },
+        )
+
+    for file_info, mcap_info in results:
+        merged_info["files"][file_info["path"]] = file_info
+        merged_info["size"] += file_info["size"]
+        file_start_time = file_info["start_time"]
+        file_end_time = file_info["end_time"]
 
         # update overall start and end times
         if (
@@ -143,46 +687,37 @@ def get_rec_info(recording_path: str, recursive: bool = False) -> Dict[str, Any]
         if merged_info["end_time"] is None or file_end_time > merged_info["end_time"]:
             merged_info["end_time"] = file_end_time
 
-        # merge topic info
+        # merge topic info, duration and frequency are calculated once all files are merged
+        merged_topics = merged_info["topics"]
         for topic, info in mcap_info.items():
-            if topic not in merged_info["topics"]:
-                merged_info["topics"][topic] = {
+            merged_topic_info = merged_topics.get(topic)
+            if merged_topic_info is None:
+                merged_topics[topic] = {
                     "name": topic,
                     "type": info["message_type"],
-                    "start_time": None,
-                    "end_time": None,
+                    "start_time": info["start_time"],
+                    "end_time": info["end_time"],
                     "duration": None,
-                    "count": 0,
+                    "count": info["num_messages"],
                     "frequency": None,
                 }
-            merged_topic_info = merged_info["topics"][topic]
+                continue
             merged_topic_info["count"] += info["num_messages"]
-            if (
-                merged_topic_info["start_time"] is None
-                or info["start_time"] < merged_topic_info["start_time"]
-            ):
+            if info["start_time"] < merged_topic_info["start_time"]:
                 merged_topic_info["start_time"] = info["start_time"]
-            if (
-                merged_topic_info["end_time"] is None
-                or info["end_time"] > merged_topic_info["end_time"]
-            ):
+            if info["end_time"] > merged_topic_info["end_time"]:
                 merged_topic_info["end_time"] = info["end_time"]
-            merged_topic_info["duration"] = (
-                merged_topic_info["end_time"] - merged_topic_info["start_time"]
-            )
-            total_duration = (
-                merged_topic_info["end_time"] - merged_topic_info["start_time"]
-            )
-            merged_topic_info["frequency"] = (
-                merged_topic_info["count"] / total_duration if total_duration > 0 else 0
-            )
+
+    for merged_topic_info in merged_info["topics"].values():
+        total_duration = merged_topic_info["end_time"] - merged_topic_info["start_time"]
+        merged_topic_info["duration"] = total_duration
+        merged_topic_info["frequency"] = (
+            merged_topic_info["count"] / total_duration if total_duration > 0 else 0
+        )
 
     # calculate overall duration
     if merged_info["start_time"] is not None and merged_info["end_time"] is not None:
         merged_info["duration"] = merged_info["end_time"] - merged_info["start_time"]
-        merged_info["size"] = sum(
-            file_info["size"] for file_info in merged_info["files"].values()
-        )
 
     # convert topics and files to lists
     merged_info["topics"] = list(merged_info["topics"].values())
@@ -201,39 +736,110 @@ def read_msg_nav_sat_fix(files, topic, step=1):
         step (int): The number of frames to skip between reads.
 
     Returns:
-        List[Dict[str, float]]: A list of dictionaries containing 'latitude', 'longitude', and 'altitude'.
+        Dict[str, np.ndarray]: A dictionary with the arrays 'stamp', 'latitude', 'longitude' and 'altitude'.
     """
 
     if isinstance(files, str):
         files = [files]
 
-    nav_sat_data = []
+    # stamps are collected as integer seconds and nanoseconds and converted at the end
+    samples = {
+        "sec": np.empty(0, dtype=np.int64),
+        "nanosec": np.empty(0, dtype=np.int64),
+        "latitude": np.empty(0, dtype=np.float64),
+        "longitude": np.empty(0, dtype=np.float64),
+        "altitude": np.empty(0, dtype=np.float64),
+    }
+    num_samples = 0
     frame_count = 0
 
+    decoder_factory = DecoderFactory()
+
     for file in files:
         with open(file, "rb") as f:
-            reader = make_reader(f, decoder_factories=[DecoderFactory()])
-
-            for schema, channel, _, ros_msg in reader.iter_decoded_messages(
-                topics=[topic]
-            ):
-                if (
-                    channel.topic == topic
-                    and schema.name == "sensor_msgs/msg/NavSatFix"
-                ):
-                    if frame_count % step == 0:
-                        nav_sat_data.append(
-                            {
-                                "stamp": ros_msg.header.stamp.sec
-                                + ros_msg.header.stamp.nanosec * 1e-9,
-                                "latitude": ros_msg.latitude,
-                                "longitude": ros_msg.longitude,
-                                "altitude": ros_msg.altitude,
-                            }
-                        )
-                    frame_count += 1
+            _advise(f, "sequential")
+            reader = make_reader(f)
+            # decoders of the NavSatFix channels, None for channels of other types
+            decoders = {}
+
+            # preallocate from the message count in the summary, if available
+            num_messages = _get_topic_message_count(reader.get_summary(), topic)
+            if num_messages is not None:
+                samples = _reserve(samples, num_samples + num_messages // step + 1)
+
+            for schema, channel, message in reader.iter_messages(topics=[topic]):
+                if channel.id not in decoders:
+                    decoders[channel.id] = (
+                        decoder_factory.decoder_for(channel.message_encoding, schema)
+                        if schema.name == "sensor_msgs/msg/NavSatFix"
+                        else None
+                    )
+                decoder = decoders[channel.id]
+                if decoder is None:
+                    continue
+
+                # only decode the messages which are kept
+                if frame_count % step == 0:
+                    if num_samples == len(samples["sec"]):
+                        samples = _reserve(samples, max(2 * num_samples, 1024))
+                    ros_msg = decoder(message.data)
+                    samples["sec"][num_samples] = ros_msg.header.stamp.sec
+                    samples["nanosec"][num_samples] = ros_msg.header.stamp.nanosec
+                    samples["latitude"][num_samples] = ros_msg.latitude
+                    samples["longitude"][num_samples] = ros_msg.longitude
+                    samples["altitude"][num_samples] = ros_msg.altitude
+                    num_samples += 1
+                frame_count += 1
+
+    sec = samples.pop("sec")[:num_samples]
+    nanosec = samples.pop("nanosec")[:num_samples]
+    result = {"stamp": sec.astype(np.float64) + nanosec.astype(np.float64) * 1e-9}
+    for key, values in samples.items():
+        result[key] = values[:num_samples].copy()
+    return result
+
+
+def _get_topic_message_count(summary, topic: str) -> Optional[int]:
+    """
+    Returns the number of messages of a topic from the statistics of an MCAP summary.
 
-    return nav_sat_data
+    Args:
+        summary (Summary): The summary of the MCAP file, may be None.
+        topic (str): The topic.
+
+    Returns:
+        int: The number of messages or None if the file has no statistics.
+    """
+    if summary is None or summary.statistics is None:
+        return None
+    counts = summary.statistics.channel_message_counts
+    return sum(
+        counts.get(channel_id, 0)
+        for channel_id, channel in summary.channels.items()
+        if channel.topic == topic
+    )
+
+
+def _reserve(arrays: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+    """
+    Grows preallocated arrays to at least the given size, keeping their content.
+
+    Args:
+        arrays (dict): The arrays by name, all of the same length.
+        size (int): The minimum length.
+
+    Returns:
+        dict: The arrays, reallocated if they were too short.
+    """
+    capacity = len(next(iter(arrays.values())))
+    if size <= capacity:
+        return arrays
+
+    grown = {}
+    for key, values in arrays.items():
+        grown[key] = np.empty(size, dtype=values.dtype)
+        grown[key][:capacity] = values
+    return grown
 
 
 def get_opencv_conversion_code(encoding: str):
@@ -256,6 +862,200 @@ def get_opencv_conversion_code(encoding: str):
     }.get(encoding, None)
 
 
+@lru_cache(maxsize=1)
+def _get_turbojpeg():
+    """Returns the libjpeg-turbo encoder, or None if PyTurboJPEG or the library is missing."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logging.warning(f"libjpeg-turbo not available, using OpenCV JPEG encoder: {e}")
+        return None
+
+
+def _encode_jpeg(image, quality: int = 90) -> Optional[bytes]:
+    """
+    Encodes an image as JPEG, with libjpeg-turbo for BGR images if it is available.
+
+    Args:
+        image (Union[np.ndarray, cv2.UMat]): The image.
+        quality (int): The JPEG quality. Defaults to 90.
+
+    Returns:
+        bytes: The JPEG data or None if the image could not be encoded.
+    """
+    jpeg = _get_turbojpeg()
+    if (
+        jpeg is not None
+        and isinstance(image, np.ndarray)
+        and image.dtype == np.uint8
+        and image.ndim == 3
+        and image.shape[2] == 3
+    ):
+        # same chroma subsampling as OpenCV's default
+        return jpeg.encode(
+            image, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420
+        )
+
+    result, encoded_image = cv2.imencode(
+        ".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality]
+    )
+    return encoded_image.tobytes() if result else None
+
+
+def _convert_color(img_np, conversion_code, keep_umat=False, dst=None):
+    """
+    Converts the color space of an image, on the OpenCL device if OpenCV has one enabled.
+
+    Args:
+        img_np (np.ndarray): The image.
+        conversion_code (int): The OpenCV color conversion code.
+        keep_umat (bool): If True, an OpenCL result is returned as cv2.UMat without downloading
+            it, e.g. to pass it on to cv2.imencode.
+        dst (np.ndarray, optional): Output buffer for the conversion on the CPU, reused if its
+            shape and type match the result.
+
+    Returns:
+        Union[np.ndarray, cv2.UMat]: The converted image.
+    """
+    if cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL():
+        image = cv2.cvtColor(cv2.UMat(img_np), conversion_code)
+        return image if keep_umat else image.get()
+    return cv2.cvtColor(img_np, conversion_code, dst=dst)
+
+
+# per-thread output buffers of the color conversion in _compress_ros_image
+_conversion_buffers = threading.local()
+
+
+def _get_conversion_buffer(height, width):
+    # the image is encoded by the same thread before the buffer is used again
+    buffer = getattr(_conversion_buffers, "buffer", None)
+    if buffer is None or buffer.shape != (height, width, 3):
+        buffer = np.empty((height, width, 3), dtype=np.uint8)
+        _conversion_buffers.buffer = buffer
+    return buffer
+
+
+def _decode_ros_image(schema_name, ros_msg, keep_umat=False, dst=None):
+    """
+    Decodes a sensor_msgs/msg/Image or sensor_msgs/msg/CompressedImage message into a BGR image.
+
+    Args:
+        schema_name (str): The schema name of the message.
+        ros_msg (Any): The decoded ROS message.
+        keep_umat (bool): If True, color conversions on the OpenCL device are returned as
+            cv2.UMat (see _convert_color).
+        dst (np.ndarray, optional): Output buffer for color conversions (see _convert_color).
+
+    Returns:
+        np.ndarray: The image or None if the schema is not an image type. Raw images which are
+            already in BGR are returned as a read-only view of the message buffer.
+    """
+    image_np = None
+    if schema_name == "sensor_msgs/msg/Image":
+        encoding = ros_msg.encoding.lower()
+        height = ros_msg.height
+        width = ros_msg.width
+
+        img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
+
+        # Handle mono8, bayer, RGB, BGR, etc.
+        if encoding in ["mono8", "mono16"]:
+            img_np = img_data.reshape((height, width))
+        elif encoding in ["bgr8", "rgb8", "rgba8", "bgra8"]:
+            img_np = img_data.reshape(
+                (
+                    height,
+                    width,
+                    3 if "8" in encoding and "a" not in encoding else 4,
+                )
+            )
+        elif encoding.startswith("bayer_"):
+            img_np = img_data.reshape((height, width))
+        elif encoding in ["yuv422", "yuv422_yuy2", "uyvy"]:
+            img_np = img_data.reshape((height, width, 2))
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+        conversion_code = get_opencv_conversion_code(encoding)
+        if conversion_code is not None:
+            image_np = _convert_color(
+                img_np, conversion_code, keep_umat=keep_umat, dst=dst
+            )
+        else:
+            image_np = img_np  # Already in BGR
+
+    elif schema_name == "sensor_msgs/msg/CompressedImage":
+        img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
+        # decode JPEG
+        image_np = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
+
+    return image_np
+
+
+def iter_msg_image(files, topics, max_workers=None):
+    """
+    Iterates over image data from one or more Camera topics in one or more MCAP files.
+    Each file is scanned only once, regardless of the number of topics. The images are
+    decoded in a thread pool while the next messages are read, in message order.
+
+    Args:
+        files (Union[str, List[str]]): The path to the MCAP file or a list of paths to MCAP files.
+        topics (Union[str, List[str]]): The topic or list of topics to read the Camera messages from.
+        max_workers (int, optional): The number of decoding threads. Defaults to the number of CPUs.
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: The topic and a dictionary containing 'stamp', 'data'.
+            'data' may be a read-only view of the message buffer (see _decode_ros_image),
+            copy it before modifying it in place.
+    """
+
+    if isinstance(files, str):
+        files = [files]
+    if isinstance(topics, str):
+        topics = [topics]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # bound the number of decoded frames held in memory
+    max_pending = 2 * max_workers
+    pending = deque()
+
+    def pop_frame():
+        topic, stamp, future = pending.popleft()
+        image_np = future.result()
+        if image_np is not None:
+            return topic, {"stamp": stamp, "data": image_np}
+        return None
+
+    # OpenCV releases the GIL while decoding, so frames are decoded in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file in files:
+            with open(file, "rb") as f:
+                _advise(f, "sequential")
+                reader = make_reader(f, decoder_factories=[DecoderFactory()])
+
+                for schema, channel, _, ros_msg in reader.iter_decoded_messages(
+                    topics=topics
+                ):
+                    stamp = (
+                        ros_msg.header.stamp.sec + ros_msg.header.stamp.nanosec * 1e-9
+                    )
+                    future = executor.submit(_decode_ros_image, schema.name, ros_msg)
+                    pending.append((channel.topic, stamp, future))
+
+                    if len(pending) >= max_pending:
+                        frame = pop_frame()
+                        if frame is not None:
+                            yield frame
+
+        while pending:
+            frame = pop_frame()
+            if frame is not None:
+                yield frame
+
+
 def read_msg_image(files, topic):
     """
     Reads image data from a Camera topic in one or more MCAP files.
@@ -268,178 +1068,226 @@ def read_msg_image(files, topic):
         List[Dict[str, Any]]: A list of dictionaries containing 'stamp', 'data'.
     """
 
-    if isinstance(files, str):
-        files = [files]
+    return [frame for _, frame in iter_msg_image(files, topic)]
 
-    camera_data = []
 
-    for file in files:
-        with open(file, "rb") as f:
-            reader = make_reader(f, decoder_factories=[DecoderFactory()])
+def _estimate_fps(stamps) -> float:
+    """
+    Estimates the frame rate from the median interval between image stamps, which is not
+    affected by gaps like the average over the whole recording.
 
-            for schema, channel, message, ros_msg in reader.iter_decoded_messages(
-                topics=[topic]
-            ):
-                image_np = None
-                if schema.name == "sensor_msgs/msg/Image":
-                    encoding = ros_msg.encoding.lower()
-                    height = ros_msg.height
-                    width = ros_msg.width
-
-                    img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-
-                    # Handle mono8, bayer, RGB, BGR, etc.
-                    if encoding in ["mono8", "mono16"]:
-                        img_np = img_data.reshape((height, width))
-                    elif encoding in ["bgr8", "rgb8", "rgba8", "bgra8"]:
-                        img_np = img_data.reshape(
-                            (
-                                height,
-                                width,
-                                3 if "8" in encoding and "a" not in encoding else 4,
-                            )
-                        )
-                    elif encoding.startswith("bayer_"):
-                        img_np = img_data.reshape((height, width))
-                    elif encoding in ["yuv422", "yuv422_yuy2", "uyvy"]:
-                        img_np = img_data.reshape((height, width, 2))
-                    else:
-                        raise ValueError(f"Unsupported encoding: {encoding}")
-
-                    conversion_code = get_opencv_conversion_code(encoding)
-                    if conversion_code is not None:
-                        image_np = cv2.cvtColor(img_np, conversion_code)
-                    else:
-                        image_np = img_np  # Already in BGR
-
-                elif schema.name == "sensor_msgs/msg/CompressedImage":
-                    img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-                    # decode JPEG
-                    image_np = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
-
-                if image_np is not None:
-                    camera_data.append(
-                        {
-                            "stamp": ros_msg.header.stamp.sec
-                            + ros_msg.header.stamp.nanosec * 1e-9,
-                            "data": image_np,
-                        }
-                    )
+    Args:
+        stamps (List[float]): The stamps of consecutive frames in seconds.
 
-    return camera_data
+    Returns:
+        float: The frame rate.
+    """
+    intervals = np.diff(np.asarray(stamps, dtype=np.float64))
+    intervals = intervals[intervals > 0]
+    if intervals.size == 0:
+        return DEFAULT_VIDEO_FPS
+    return float(1.0 / np.median(intervals))
+
+
+@lru_cache(maxsize=1)
+def _get_video_encoder() -> Optional[str]:
+    """
+    Selects the H.264 encoder of ffmpeg, preferring a working hardware encoder.
+
+    Returns:
+        str: The name of the encoder or None if ffmpeg is not available.
+    """
+    if shutil.which("ffmpeg") is None:
+        logging.warning("ffmpeg not found, videos are written as MPEG-4 by OpenCV")
+        return None
+
+    encoders = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-encoders"],
+        capture_output=True,
+        text=True,
+    ).stdout
+    for encoder in HW_VIDEO_ENCODERS:
+        if f" {encoder} " not in encoders:
+            continue
+        # encoders are listed even if the hardware is missing, encode a short test clip
+        probe = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=size=256x256:duration=0.1",
+                "-c:v",
+                encoder,
+                "-f",
+                "null",
+                "-",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if probe.returncode == 0:
+            return encoder
+    return "libx264"
+
+
+class FFmpegVideoWriter:
+    """
+    Encodes BGR frames to an H.264 video by piping them to ffmpeg.
+    Frames are written like with cv2.VideoWriter, frames of a different size are skipped.
+    """
+
+    def __init__(self, video_file, fps, frame_size, encoder="libx264"):
+        self.video_file = video_file
+        self.frame_shape = (frame_size[1], frame_size[0], 3)
+        self.proc = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "bgr24",
+                "-s",
+                f"{frame_size[0]}x{frame_size[1]}",
+                "-r",
+                str(fps),
+                "-i",
+                "-",
+                "-c:v",
+                encoder,
+                "-pix_fmt",
+                "yuv420p",
+                video_file,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def write(self, frame):
+        if frame.shape != self.frame_shape:
+            logging.warning(
+                f"Skipping frame with shape {frame.shape} for {self.video_file}"
+            )
+            return
+        self.proc.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8))
+
+    def release(self):
+        if self.proc.stdin.closed:
+            return
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to encode {self.video_file} (exit code {self.proc.returncode})"
+            )
 
 
-def mcap_to_video(files, topic, video_file, fps=None):
+def mcap_to_video(files, topics, video_files, fps=None):
     """
-    Converts image data from a Camera topic in one or more MCAP files into a video file.
+    Converts image data from one or more Camera topics in one or more MCAP files into video files.
+    All topics are demultiplexed from a single pass over the MCAP files.
 
     Args:
         files (Union[str, List[str]]): The path to the MCAP file or a list of paths to MCAP files.
-        topic (str): The topic to read the Camera messages from.
-        video_file (str): The path to the output video file.
-        fps (int): Frames per second for the output video.
+        topics (Union[str, List[str]]): The topic or list of topics to read the Camera messages from.
+        video_files (Union[str, List[str]]): The path to the output video file for each topic.
+        fps (Union[int, List[int]], optional): Frames per second for each output video.
+                                               If None, it is estimated from the image stamps.
+
+    Returns:
+        List[str]: The paths of the video files which have been written.
     """
     if isinstance(files, str):
         files = [files]
-
-    # get fps and resolution
-    resolution = None
-    with open(files[0], "rb") as f:
-        reader = make_reader(f, decoder_factories=[DecoderFactory()])
-
-        # calculate fps from message count and duration
-        if fps is None:
-            summary = reader.get_summary()
-            channel_id = next(
-                (s.id for k, s in summary.channels.items() if s.topic == topic), None
+    if isinstance(topics, str):
+        topics = [topics]
+        video_files = [video_files]
+        fps = [fps]
+    if fps is None or isinstance(fps, (int, float)):
+        fps = [fps] * len(topics)
+
+    video_files = dict(zip(topics, video_files))
+    fps = dict(zip(topics, fps))
+
+    # video writers are created with the resolution of the first frame of each topic,
+    # topics without fps buffer their first frames to estimate it from the stamps
+    encoder = _get_video_encoder()
+    writers = {}
+    buffered_frames = defaultdict(list)
+
+    def open_writer(topic, frames):
+        if fps[topic] is None:
+            fps[topic] = _estimate_fps([frame["stamp"] for frame in frames])
+        height, width = frames[0]["data"].shape[:2]
+        if encoder is not None:
+            out = FFmpegVideoWriter(
+                video_files[topic], fps[topic], (width, height), encoder
             )
-            if channel_id is None:
-                raise ValueError(
-                    f"Channel with topic '{topic}' not found in the provided MCAP files."
-                )
-            message_count = summary.statistics.channel_message_counts[channel_id]
-            duration = (
-                summary.statistics.message_end_time
-                - summary.statistics.message_start_time
-            ) / 1e9  # sec
-            fps = int(message_count / duration) + (message_count % duration > 0)
-
-        # read first message to get resolution
-        for schema, channel, message, ros_msg in reader.iter_decoded_messages(
-            topics=[topic]
-        ):
-            if schema.name == "sensor_msgs/msg/Image":
-                resolution = [ros_msg.width, ros_msg.height]
-            elif schema.name == "sensor_msgs/msg/CompressedImage":
-                img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-                img = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
-                resolution = [img.shape[1], img.shape[0]]  # width, height
-            break
-
-    if resolution is None:
-        raise ValueError(
-            "Resolution could not be determined from the provided MCAP files."
-        )
+        else:
+            # without ffmpeg the video is written as MPEG-4 by OpenCV
+            out = cv2.VideoWriter(
+                video_files[topic],
+                cv2.VideoWriter_fourcc(*"mp4v"),
+                fps[topic],
+                (width, height),
+            )
+        writers[topic] = out
+        for frame in frames:
+            out.write(frame["data"])
+
+    try:
+        for topic, frame in iter_msg_image(files, topics):
+            out = writers.get(topic)
+            if out is not None:
+                out.write(frame["data"])
+                continue
+
+            frames = buffered_frames[topic]
+            frames.append(frame)
+            if fps[topic] is None and len(frames) < FPS_ESTIMATE_FRAMES:
+                continue
+            open_writer(topic, buffered_frames.pop(topic))
+
+        # topics with fewer frames than needed for the estimate
+        for topic, frames in buffered_frames.items():
+            if frames:
+                open_writer(topic, frames)
+    finally:
+        for out in writers.values():
+            out.release()
+
+    return [video_files[topic] for topic in topics if topic in writers]
+
+
+def _compress_ros_image(decoder, data: bytes):
+    """
+    Decodes a sensor_msgs/msg/Image message and encodes the image as JPEG.
 
-    # video writer
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    out = cv2.VideoWriter(
-        video_file,
-        fourcc,
-        fps,
-        (resolution[0], resolution[1]),
-    )
+    Args:
+        decoder (Callable): The decoder of the message schema.
+        data (bytes): The serialized message.
 
-    for file in files:
-        with open(file, "rb") as f:
-            reader = make_reader(f, decoder_factories=[DecoderFactory()])
-
-            for schema, channel, message, ros_msg in reader.iter_decoded_messages(
-                topics=[topic]
-            ):
-                if channel.topic == topic:
-                    image_np = None
-
-                    if schema.name == "sensor_msgs/msg/Image":
-                        encoding = ros_msg.encoding.lower()
-                        height = ros_msg.height
-                        width = ros_msg.width
-
-                        img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-
-                        # Handle mono8, bayer, RGB, BGR, etc.
-                        if encoding in ["mono8", "mono16"]:
-                            img_np = img_data.reshape((height, width))
-                        elif encoding in ["bgr8", "rgb8", "rgba8", "bgra8"]:
-                            img_np = img_data.reshape(
-                                (
-                                    height,
-                                    width,
-                                    3 if "8" in encoding and "a" not in encoding else 4,
-                                )
-                            )
-                        elif encoding.startswith("bayer_"):
-                            img_np = img_data.reshape((height, width))
-                        elif encoding in ["yuv422", "yuv422_yuy2", "uyvy"]:
-                            img_np = img_data.reshape((height, width, 2))
-                        else:
-                            raise ValueError(f"Unsupported encoding: {encoding}")
-
-                        conversion_code = get_opencv_conversion_code(encoding)
-                        if conversion_code is not None:
-                            image_np = cv2.cvtColor(img_np, conversion_code)
-                        else:
-                            image_np = img_np  # Already in BGR
-
-                    elif schema.name == "sensor_msgs/msg/CompressedImage":
-                        img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-                        # Decode JPEG
-                        image_np = cv2.imdecode(img_data, cv2.IMREAD_COLOR)
-
-                    # Write image to video
-                    if image_np is not None:
-                        out.write(image_np)
-    out.release()
+    Returns:
+        Tuple[Any, Optional[bytes]]: The decoded message and the JPEG data, or None if the
+            image could not be encoded.
+    """
+    ros_msg = decoder(data)
+    # converted images stay on the OpenCL device until they are encoded,
+    # on the CPU they are converted into a buffer which is reused for the next image
+    image_np = _decode_ros_image(
+        "sensor_msgs/msg/Image",
+        ros_msg,
+        keep_umat=True,
+        dst=_get_conversion_buffer(ros_msg.height, ros_msg.width),
+    )
+    return ros_msg, _encode_jpeg(image_np, quality=90)
 
 
 def compress_image(
@@ -448,105 +1296,108 @@ def compress_image(
     topics=None,
     compressed_suffix="/compressed",
     remove_uncompressed=False,
+    max_workers=None,
 ):
+    max_workers = max_workers or os.cpu_count() or 1
+    # bound the number of messages held in memory while images are compressed,
+    # keep a full batch in flight so a slow frame does not stall the other workers
+    max_pending = max(COMPRESS_BATCH_SIZE, 2 * max_workers)
+    pending = deque()
+
     with open(output_file, "wb") as fo:
         writer = McapWriter(fo)
 
-        with open(file, "rb") as fi:
-            reader = make_reader(fi, decoder_factories=[DecoderFactory()])
+        schema_compressed_image = writer.register_msgdef(
+            "sensor_msgs/msg/CompressedImage",
+            schema_ros["sensor_msgs/msg/CompressedImage"],
+        )
+
+        def write_entry(channel, schema_updated, message, future):
+            if future is not None:
+                ros_msg, encoded_image = future.result()
+                if encoded_image is not None:
+                    ros_msg_encoded = {
+                        "header": {
+                            "stamp": {
+                                "sec": ros_msg.header.stamp.sec,
+                                "nanosec": ros_msg.header.stamp.nanosec,
+                            },
+                            "frame_id": ros_msg.header.frame_id,
+                        },
+                        "format": "jpeg",
+                        "data": encoded_image,
+                    }
+
+                    topic_compressed = channel.topic + compressed_suffix
+
+                    writer.write_message(
+                        topic=topic_compressed,
+                        schema=schema_compressed_image,
+                        message=ros_msg_encoded,
+                        log_time=message.log_time,
+                        publish_time=message.publish_time,
+                    )
 
-            schema_compressed_image = writer.register_msgdef(
-                "sensor_msgs/msg/CompressedImage",
-                schema_ros["sensor_msgs/msg/CompressedImage"],
-            )
+                    if remove_uncompressed:
+                        return
 
-            for schema, channel, message, ros_msg in reader.iter_decoded_messages():
-                schema_updated = copy.copy(schema)
-                schema_updated.id = next(
-                    (
-                        s.id
-                        for k, s in writer._writer._Writer__schemas.items()
-                        if s.name == schema.name
-                    ),
-                    None,
+            # write other messages as is, without re-encoding
+            channel_id = writer._channel_ids.get(channel.topic)
+            if channel_id is None:
+                channel_id = writer._writer.register_channel(
+                    topic=channel.topic,
+                    message_encoding=channel.message_encoding,
+                    schema_id=schema_updated.id,
                 )
-                if schema_updated.id is None:
+                writer._channel_ids[channel.topic] = channel_id
+            writer._writer.add_message(
+                channel_id=channel_id,
+                log_time=message.log_time,
+                publish_time=message.publish_time,
+                sequence=message.sequence,
+                data=message.data,
+            )
+
+        # images are compressed in a thread pool while the next messages are read,
+        # all messages are written in their original order by this thread
+        with open(file, "rb") as fi, ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            _advise(fi, "sequential")
+            reader = make_reader(fi)
+            decoder_factory = DecoderFactory()
+            decoders = {}
+            schemas = {schema_compressed_image.name: schema_compressed_image}
+
+            for schema, channel, message in reader.iter_messages():
+                # schemas are registered once per name in the output file
+                schema_updated = schemas.get(schema.name)
+                if schema_updated is None:
+                    schema_updated = copy.copy(schema)
                     schema_updated.id = writer._writer.register_schema(
                         schema.name, schema.encoding, schema.data
                     )
+                    schemas[schema.name] = schema_updated
 
+                future = None
                 if schema.name == "sensor_msgs/msg/Image":
                     if topics is not None and channel.topic not in topics:
                         continue
 
-                    image_np = None
-                    encoding = ros_msg.encoding.lower()
-                    height = ros_msg.height
-                    width = ros_msg.width
-
-                    img_data = np.frombuffer(ros_msg.data, dtype=np.uint8)
-
-                    # handle mono8, bayer, RGB, BGR, etc.
-                    if encoding in ["mono8", "mono16"]:
-                        img_np = img_data.reshape((height, width))
-                    elif encoding in ["bgr8", "rgb8", "rgba8", "bgra8"]:
-                        img_np = img_data.reshape(
-                            (
-                                height,
-                                width,
-                                3 if "8" in encoding and "a" not in encoding else 4,
-                            )
-                        )
-                    elif encoding.startswith("bayer_"):
-                        img_np = img_data.reshape((height, width))
-                    elif encoding in ["yuv422", "yuv422_yuy2", "uyvy"]:
-                        img_np = img_data.reshape((height, width, 2))
-                    else:
-                        raise ValueError(f"Unsupported encoding: {encoding}")
-
-                    conversion_code = get_opencv_conversion_code(encoding)
-                    if conversion_code is not None:
-                        image_np = cv2.cvtColor(img_np, conversion_code)
-                    else:
-                        image_np = img_np  # Already in BGR
-
-                    # compress image
-                    encode_param = [cv2.IMWRITE_JPEG_QUALITY, 90]
-                    result, encoded_image = cv2.imencode(".jpg", image_np, encode_param)
-                    if result:
-                        ros_msg_encoded = {
-                            "header": {
-                                "stamp": {
-                                    "sec": ros_msg.header.stamp.sec,
-                                    "nanosec": ros_msg.header.stamp.nanosec,
-                                },
-                                "frame_id": ros_msg.header.frame_id,
-                            },
-                            "format": "jpeg",
-                            "data": encoded_image.tobytes(),
-                        }
-
-                        topic_compressed = channel.topic + compressed_suffix
-
-                        writer.write_message(
-                            topic=topic_compressed,
-                            schema=schema_compressed_image,
-                            message=ros_msg_encoded,
-                            log_time=message.log_time,
-                            publish_time=message.publish_time,
+                    # only images are decoded, all other messages are copied as is
+                    decoder = decoders.get(schema.id)
+                    if decoder is None:
+                        decoder = decoder_factory.decoder_for(
+                            channel.message_encoding, schema
                         )
+                        decoders[schema.id] = decoder
+                    future = executor.submit(_compress_ros_image, decoder, message.data)
 
-                        if remove_uncompressed:
-                            continue
+                pending.append((channel, schema_updated, message, future))
+                if len(pending) >= max_pending:
+                    write_entry(*pending.popleft())
 
-                # write other messages as is
-                writer.write_message(
-                    topic=channel.topic,
-                    schema=schema_updated,
-                    message=ros_msg,
-                    log_time=message.log_time,
-                    publish_time=message.publish_time,
-                    sequence=message.sequence,
-                )
+            while pending:
+                write_entry(*pending.popleft())
 
-            writer.finish()
+        writer.finish()
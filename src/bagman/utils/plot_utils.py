@@ -2,32 +2,42 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 
+# trajectories with more points are downsampled, the map file embeds every point
+MAP_MAX_POINTS = 5000
 
-def plot_map(positions, output_file, color_map="matter"):
-    if len(positions) == 0:
+
+def plot_map(positions, output_file, color_map="matter", max_points=MAP_MAX_POINTS):
+    # positions is either a list of dicts or a dict of equally sized arrays
+    # arrays are used as columns as they are instead of being copied
+    df = pd.DataFrame(positions, copy=False)
+    if len(df) == 0:
         return
 
-    # convert positions to DataFrame
-    df = pd.DataFrame(positions)
-    df["time"] = df["stamp"] - df["stamp"].iloc[0]
+    stamps = df["stamp"].to_numpy()
+    df["time"] = stamps - stamps[0]
+
+    # bounding box of the trajectory in a single pass over each column
+    longitude = df["longitude"].to_numpy()
+    latitude = df["latitude"].to_numpy()
+    lon_min, lon_max = longitude.min(), longitude.max()
+    lat_min, lat_max = latitude.min(), latitude.max()
 
     # auto-zoom inspired by: https://stackoverflow.com/a/65043576
-    max_bound = (
-        max(
-            abs(max(df["longitude"]) - min(df["longitude"])),
-            abs(max(df["latitude"]) - min(df["latitude"])),
-        )
-        * 111
-    )
+    max_bound = max(abs(lon_max - lon_min), abs(lat_max - lat_min)) * 111
     if np.log(max_bound) > 0:
         zoom = -0.04 * max_bound + 16 - np.log(max_bound)
     else:
         zoom = 16
     center = {
-        "lat": min(df["latitude"]) + (max(df["latitude"]) - min(df["latitude"])) / 2,
-        "lon": min(df["longitude"]) + (max(df["longitude"]) - min(df["longitude"])) / 2,
+        "lat": lat_min + (lat_max - lat_min) / 2,
+        "lon": lon_min + (lon_max - lon_min) / 2,
     }
 
+    if max_points is not None and len(df) > max_points:
+        # keep every n-th point, the zoom and center are based on all of them
+        stride = -(-len(df) // max_points)
+        df = df.iloc[::stride]
+
     if "speed" in df.columns:
         map_figure = px.scatter_mapbox(
             df,